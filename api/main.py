@@ -3,18 +3,28 @@ FastAPI application for Newegg Web Scraper
 Provides REST API endpoints for scraping Newegg products and reviews
 """
 import asyncio
+import concurrent.futures
+import functools
 import logging
 import os
 import sys
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Path
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, HttpUrl, Field, field_validator
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field, TypeAdapter, field_validator
 import uvicorn
+import orjson
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -23,6 +33,7 @@ sys.path.insert(0, project_root)
 from src.scraper.newegg_scraper import NeweggScraper
 from src.storage.sqlite_handler import SQLiteHandler
 from src.storage.duckdb_handler import DuckDBHandler
+from src.storage.serialization import json_default
 from src.analysis.large_scale_analyzer import LargeScaleAnalyzer, run_large_scale_analysis, get_analysis_summary
 
 # Configure logging
@@ -37,52 +48,87 @@ sqlite_handler = None
 duckdb_handler = None
 large_scale_analyzer = None
 
+# Shared scraper (one pooled HTTP session reused across requests)
+newegg_scraper = None
+
+# Upper bound on scrapes running at the same time
+SCRAPE_CONCURRENCY = int(os.environ.get("SCRAPE_CONCURRENCY", "16"))
+scrape_semaphore = None
+
+# Worker threads for blocking SQLite/DuckDB calls so they don't stall the event loop
+DB_POOL_WORKERS = int(os.environ.get("DB_POOL_WORKERS", "8"))
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking database call on the lifespan's DB thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.db_pool, functools.partial(func, *args, **kwargs))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and cleanup resources"""
-    global sqlite_handler, duckdb_handler, large_scale_analyzer
+    global sqlite_handler, duckdb_handler, large_scale_analyzer, newegg_scraper
+    global analytics_queue, analytics_flush_task, scrape_semaphore
     
     # Startup
     logger.info("Initializing FastAPI Newegg Scraper...")
+    # Per-lifespan pool, so a restarted app doesn't submit to an executor that was shut down
+    app.state.db_pool = concurrent.futures.ThreadPoolExecutor(
+        max_workers=DB_POOL_WORKERS,
+        thread_name_prefix="db"
+    )
     try:
         sqlite_handler = SQLiteHandler()
         duckdb_handler = DuckDBHandler()
-        large_scale_analyzer = LargeScaleAnalyzer()
+        # One DuckDB handler, so a dataset reload invalidates the API's cached results too
+        large_scale_analyzer = LargeScaleAnalyzer(duckdb_handler=duckdb_handler)
         logger.info("Database handlers and analyzer initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database handlers: {e}")
-        
-    yield
     
-    # Cleanup
-    logger.info("Shutting down FastAPI Newegg Scraper...")
     try:
-        if sqlite_handler:
-            sqlite_handler.close()
-        if duckdb_handler:
-            duckdb_handler.close()
-        if large_scale_analyzer:
-            large_scale_analyzer.cleanup()
-        logger.info("Resources cleaned up successfully")
+        newegg_scraper = NeweggScraper()
+        await newegg_scraper.initialize()
     except Exception as e:
-        logger.error(f"Error during cleanup: {e}")
-        raise
+        logger.error(f"Failed to initialize scraper: {e}")
     
-    yield
+    scrape_semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    analytics_queue = asyncio.Queue()
+    analytics_flush_task = asyncio.create_task(flush_analytics_loop(analytics_queue))
     
-    # Shutdown
-    logger.info("Shutting down FastAPI Newegg Scraper...")
-    if sqlite_handler:
-        sqlite_handler.close()
-    if duckdb_handler:
-        duckdb_handler.close()
+    try:
+        yield
+    finally:
+        # Shutdown
+        logger.info("Shutting down FastAPI Newegg Scraper...")
+        try:
+            analytics_flush_task.cancel()
+            try:
+                await analytics_flush_task
+            except asyncio.CancelledError:
+                pass
+            flush_analytics()
+            if newegg_scraper:
+                await newegg_scraper.cleanup()
+        except Exception as e:
+            logger.error(f"Error during cleanup: {e}")
+        finally:
+            # Always release database files, even if the steps above failed
+            if sqlite_handler:
+                sqlite_handler.close()
+            if duckdb_handler:
+                duckdb_handler.close()
+            if large_scale_analyzer:
+                large_scale_analyzer.cleanup()
+            app.state.db_pool.shutdown(wait=True)
+            logger.info("Resources cleaned up successfully")
 
 # FastAPI app
 app = FastAPI(
     title="Newegg Web Scraper API",
     description="Enhanced web scraper for Newegg products and reviews with Cloudflare bypass",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -94,6 +140,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@functools.lru_cache(maxsize=1024)
+def is_newegg_host(host: str) -> bool:
+    """Check whether a hostname is newegg.com or one of its subdomains"""
+    return host == 'newegg.com' or host.endswith('.newegg.com')
+
 # Pydantic models
 class ScrapeRequest(BaseModel):
     """Request model for scraping operation"""
@@ -104,8 +155,8 @@ class ScrapeRequest(BaseModel):
     @field_validator('url')
     @classmethod
     def validate_newegg_url(cls, v):
-        url_str = str(v)
-        if 'newegg.com' not in url_str:
+        host = urlsplit(str(v)).hostname or ''
+        if not is_newegg_host(host):
             raise ValueError('URL must be from newegg.com')
         return v
     
@@ -117,8 +168,24 @@ class ScrapeRequest(BaseModel):
             raise ValueError(f'Method must be one of: {valid_methods}')
         return v.lower()
 
+class BatchScrapeRequest(BaseModel):
+    """Request model for scraping several products in one call"""
+    urls: List[HttpUrl] = Field(..., min_length=1, max_length=50, description="Newegg product URLs to scrape")
+    target_reviews: int = Field(50, ge=1, le=500, description="Number of reviews to scrape per product (1-500)")
+    method: str = Field("fallback", description="Scraping method: selenium, cloudscraper, aiohttp, or fallback")
+    concurrency: int = Field(8, ge=1, le=32, description="Products scraped at the same time (1-32)")
+    
+    def to_requests(self) -> List[ScrapeRequest]:
+        """Split into one validated ScrapeRequest per URL"""
+        return [
+            ScrapeRequest(url=url, target_reviews=self.target_reviews, method=self.method)
+            for url in self.urls
+        ]
+
 class ProductResponse(BaseModel):
     """Response model for product information"""
+    model_config = ConfigDict(extra='ignore')
+    
     id: Optional[int] = None
     title: Optional[str] = None
     brand: Optional[str] = None
@@ -131,6 +198,8 @@ class ProductResponse(BaseModel):
 
 class ReviewResponse(BaseModel):
     """Response model for review information"""
+    model_config = ConfigDict(extra='ignore')
+    
     id: Optional[int] = None
     product_id: Optional[int] = None
     reviewer_name: Optional[str] = None
@@ -143,6 +212,8 @@ class ReviewResponse(BaseModel):
 
 class ScrapeResponse(BaseModel):
     """Response model for scraping operation"""
+    model_config = ConfigDict(extra='ignore')
+    
     success: bool
     product: Optional[ProductResponse] = None
     reviews: List[ReviewResponse] = []
@@ -153,39 +224,207 @@ class ScrapeResponse(BaseModel):
 
 class JobStatus(BaseModel):
     """Background job status"""
+    model_config = ConfigDict(extra='ignore')
+    
     job_id: str
     status: str  # pending, running, completed, failed
     created_at: datetime
     completed_at: Optional[datetime] = None
-    result: Optional[ScrapeResponse] = None
+    result: Optional[Union[ScrapeResponse, Dict[str, Any]]] = None
     error: Optional[str] = None
 
-# In-memory job storage (use Redis in production)
-jobs: Dict[str, JobStatus] = {}
+# Validates a whole review list in pydantic-core instead of one model per loop iteration
+REVIEWS_ADAPTER = TypeAdapter(List[ReviewResponse])
+
+def build_review_responses(reviews: List[Dict[str, Any]], review_ids: List[int],
+                           product_id: Optional[int]) -> List[ReviewResponse]:
+    """Attach IDs to scraped reviews and validate them in one batch"""
+    enriched_reviews = [
+        {**review_data, 'id': review_ids[i] if i < len(review_ids) else None, 'product_id': product_id}
+        for i, review_data in enumerate(reviews)
+    ]
+    return REVIEWS_ADAPTER.validate_python(enriched_reviews)
+
+class JobStore:
+    """
+    Job status storage shared by all API workers
+    Uses a Redis hash when REDIS_URL is set, otherwise an in-process LRU dict
+    capped at max_jobs, evicting the least recently updated finished jobs
+    """
+    
+    REDIS_KEY = "newegg_scraper:jobs"
+    ACTIVE_STATUSES = ("pending", "running")
+    
+    def __init__(self, redis_url: Optional[str] = None, max_jobs: int = 10000):
+        self._jobs: "OrderedDict[str, JobStatus]" = OrderedDict()
+        self._by_status: Dict[str, set] = {}
+        self.max_jobs = max_jobs
+        self._redis = None
+        
+        if redis_url:
+            if redis is None:
+                logger.warning("REDIS_URL is set but redis is not installed; using in-memory job storage")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+                logger.info("Using Redis job storage")
+    
+    def __contains__(self, job_id: str) -> bool:
+        if self._redis:
+            return bool(self._redis.hexists(self.REDIS_KEY, job_id))
+        return job_id in self._jobs
+    
+    def __getitem__(self, job_id: str) -> JobStatus:
+        if self._redis:
+            raw = self._redis.hget(self.REDIS_KEY, job_id)
+            if raw is None:
+                raise KeyError(job_id)
+            return JobStatus.model_validate_json(raw)
+        return self._jobs[job_id]
+    
+    def __setitem__(self, job_id: str, job: JobStatus):
+        if self._redis:
+            self._redis.hset(self.REDIS_KEY, job_id, orjson.dumps(job.model_dump(), default=json_default, option=orjson.OPT_SERIALIZE_NUMPY))
+            return
+        
+        self._unindex(job_id)
+        self._jobs[job_id] = job
+        self._jobs.move_to_end(job_id)
+        self._by_status.setdefault(job.status, set()).add(job_id)
+        self._evict()
+    
+    def __delitem__(self, job_id: str):
+        if self._redis:
+            self._redis.hdel(self.REDIS_KEY, job_id)
+        else:
+            self._unindex(job_id)
+            del self._jobs[job_id]
+    
+    def _unindex(self, job_id: str):
+        """Drop a job from the status index (update_job mutates status in place)"""
+        for job_ids in self._by_status.values():
+            job_ids.discard(job_id)
+    
+    def _evict(self):
+        """Drop the oldest finished jobs until the store is back under max_jobs"""
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].status not in self.ACTIVE_STATUSES:
+                del self[job_id]
+    
+    def __len__(self) -> int:
+        if self._redis:
+            return self._redis.hlen(self.REDIS_KEY)
+        return len(self._jobs)
+    
+    def items(self) -> List[tuple]:
+        if self._redis:
+            return [
+                (job_id.decode(), JobStatus.model_validate_json(raw))
+                for job_id, raw in self._redis.hgetall(self.REDIS_KEY).items()
+            ]
+        return list(self._jobs.items())
+    
+    def values(self) -> List[JobStatus]:
+        return [job for _, job in self.items()]
+    
+    def by_status(self, status: str) -> List[JobStatus]:
+        """Jobs with the given status (indexed lookup for in-memory storage)"""
+        if self._redis:
+            return [job for job in self.values() if job.status == status]
+        return [self._jobs[job_id] for job_id in self._by_status.get(status, ())]
+
+# Job storage (set REDIS_URL to share jobs across workers and restarts)
+MAX_JOBS = int(os.environ.get("MAX_JOBS", "10000"))
+jobs = JobStore(os.environ.get("REDIS_URL"), max_jobs=MAX_JOBS)
+
+def update_job(job_id: str, **fields):
+    """Update fields on a stored job and write it back to the job store"""
+    job = jobs[job_id]
+    for field, value in fields.items():
+        setattr(job, field, value)
+    jobs[job_id] = job
+
+# Scraping analytics rows queued by the scrape handlers and written to DuckDB in bulk
+ANALYTICS_FLUSH_SIZE = 10000
+ANALYTICS_FLUSH_INTERVAL = 1.0
+analytics_queue: Optional[asyncio.Queue] = None
+analytics_flush_task: Optional[asyncio.Task] = None
+
+async def queue_analytics(row: Dict[str, Any]):
+    """Queue an analytics row for the background flush task"""
+    if analytics_queue is not None:
+        await analytics_queue.put(row)
+
+async def flush_analytics_loop(queue: asyncio.Queue):
+    """Drain the analytics queue every second (or every 10k rows) into one insert"""
+    loop = asyncio.get_running_loop()
+    batch: List[Dict[str, Any]] = []
+    try:
+        while True:
+            batch.append(await queue.get())
+            deadline = loop.time() + ANALYTICS_FLUSH_INTERVAL
+            
+            while len(batch) < ANALYTICS_FLUSH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Detach the batch before handing it to the pool; the shielded insert
+            # still finishes if shutdown cancels this task, and is not repeated below
+            pending, batch = batch, []
+            if duckdb_handler:
+                await asyncio.shield(run_db(duckdb_handler.insert_analytics_batch, pending))
+    finally:
+        # Keep rows that were pulled off the queue but not yet handed to the pool
+        if batch and duckdb_handler:
+            duckdb_handler.insert_analytics_batch(batch)
+
+def drain_analytics_queue() -> List[Dict[str, Any]]:
+    """Take every row still waiting in the analytics queue (call from the event loop)"""
+    rows = []
+    if analytics_queue is not None:
+        while not analytics_queue.empty():
+            rows.append(analytics_queue.get_nowait())
+    return rows
+
+def flush_analytics() -> int:
+    """Write any rows still waiting in the analytics queue to DuckDB"""
+    if not duckdb_handler:
+        return 0
+    return duckdb_handler.insert_analytics_batch(drain_analytics_queue())
 
 # API Endpoints
 
+# Static part of the health check payload, built once at import
+ROOT_PAYLOAD = {
+    "message": "Newegg Web Scraper API",
+    "version": "2.0.0",
+    "status": "healthy",
+    "features": [
+        "Multi-strategy scraping (Selenium, CloudScraper, aiohttp)",
+        "Enhanced Cloudflare bypass",
+        "JSON-LD structured data support",
+        "Concurrent scraping with rate limiting",
+        "SQLite and DuckDB storage",
+        "Background job processing",
+        "Large-scale dataset analysis (2M+ rows)",
+        "Advanced statistical insights",
+        "Category performance analytics",
+        "Scalable query optimization"
+    ]
+}
+
 @app.get("/", summary="API Health Check")
 async def root():
     """Health check endpoint"""
-    return {
-        "message": "Newegg Web Scraper API",
-        "version": "2.0.0",
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "features": [
-            "Multi-strategy scraping (Selenium, CloudScraper, aiohttp)",
-            "Enhanced Cloudflare bypass",
-            "JSON-LD structured data support",
-            "Concurrent scraping with rate limiting",
-            "SQLite and DuckDB storage",
-            "Background job processing",
-            "Large-scale dataset analysis (2M+ rows)",
-            "Advanced statistical insights",
-            "Category performance analytics",
-            "Scalable query optimization"
-        ]
-    }
+    return {**ROOT_PAYLOAD, "timestamp": datetime.now()}
 
 @app.post("/scrape", response_model=ScrapeResponse, summary="Scrape Newegg Product")
 async def scrape_product(request: ScrapeRequest):
@@ -201,14 +440,15 @@ async def scrape_product(request: ScrapeRequest):
     try:
         logger.info(f"Starting synchronous scrape for: {request.url}")
         
-        # Initialize scraper
-        scraper = NeweggScraper()
+        # Reuse the shared scraper and its connection pool
+        scraper = newegg_scraper
         
-        # Perform scraping
-        result_data = await scraper.scrape_product_and_reviews(
-            url=str(request.url),
-            max_reviews=request.target_reviews
-        )
+        # Perform scraping (waits for a free slot when at capacity)
+        async with scrape_semaphore:
+            result_data = await scraper.scrape_product_and_reviews(
+                url=str(request.url),
+                max_reviews=request.target_reviews
+            )
         
         if not result_data or not result_data.get('product'):
             raise HTTPException(
@@ -216,23 +456,19 @@ async def scrape_product(request: ScrapeRequest):
                 detail=f"Scraping failed: No product data returned"
             )
         
-        # Store results in database
-        product_id = None
-        if result_data.get('product'):
-            product_data = result_data['product']
-            product_data['url'] = str(request.url)
-            product_id = sqlite_handler.save_product(product_data)
-        
-        review_ids = []
-        if result_data.get('reviews') and product_id:
-            # save_reviews expects a list and product_id
-            num_saved = sqlite_handler.save_reviews(result_data['reviews'], product_id)
-            # Generate placeholder review IDs since save_reviews returns count
-            review_ids = list(range(num_saved))
-        
-        # Store analytics data in DuckDB
+        # Store product and reviews in a single transaction
+        product_data = result_data['product']
+        product_data['url'] = str(request.url)
+        product_id, num_saved = await run_db(
+            sqlite_handler.save_product_with_reviews,
+            product_data, result_data.get('reviews') or []
+        )
+        # Generate placeholder review IDs since save_reviews returns count
+        review_ids = list(range(num_saved))
+        
+        # Queue analytics data for bulk insert into DuckDB
         if product_id:
-            duckdb_handler.insert_analytics_data({
+            await queue_analytics({
                 'product_id': product_id,
                 'total_reviews': len(review_ids),
                 'scraping_method': request.method,
@@ -250,14 +486,9 @@ async def scrape_product(request: ScrapeRequest):
                 **result_data['product']
             )
         
-        review_responses = []
-        if result_data.get('reviews'):
-            for i, review_data in enumerate(result_data['reviews']):
-                review_responses.append(ReviewResponse(
-                    id=review_ids[i] if i < len(review_ids) else None,
-                    product_id=product_id,
-                    **review_data
-                ))
+        review_responses = build_review_responses(
+            result_data.get('reviews') or [], review_ids, product_id
+        )
         
         return ScrapeResponse(
             success=True,
@@ -283,6 +514,28 @@ async def scrape_product(request: ScrapeRequest):
             message=f"Scraping failed: {str(e)}"
         )
 
+@app.post("/scrape/batch", response_model=List[ScrapeResponse], summary="Scrape Several Newegg Products")
+async def scrape_products_batch(request: BatchScrapeRequest):
+    """
+    Scrape several Newegg products concurrently
+    
+    - **urls**: Newegg product URLs (up to 50)
+    - **concurrency**: Number of products scraped at the same time (1-32)
+    """
+    try:
+        scrape_requests = request.to_requests()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    # Per-request limit; the global scrape_semaphore still caps the whole server
+    semaphore = asyncio.Semaphore(request.concurrency)
+    
+    async def scrape_one(scrape_request: ScrapeRequest) -> ScrapeResponse:
+        async with semaphore:
+            return await scrape_product(scrape_request)
+    
+    return await asyncio.gather(*(scrape_one(r) for r in scrape_requests))
+
 @app.post("/scrape/async", summary="Start Background Scraping Job")
 async def scrape_product_async(request: ScrapeRequest, background_tasks: BackgroundTasks):
     """
@@ -320,44 +573,44 @@ async def run_background_scrape(job_id: str, request: ScrapeRequest):
     """Run scraping operation in background"""
     try:
         # Update job status
-        jobs[job_id].status = "running"
+        update_job(job_id, status="running")
         
         start_time = datetime.now()
         
-        # Initialize scraper
-        scraper = NeweggScraper()
+        # Reuse the shared scraper and its connection pool
+        scraper = newegg_scraper
         
-        # Perform scraping
-        result_data = await scraper.scrape_product_and_reviews(
-            url=str(request.url),
-            max_reviews=request.target_reviews
-        )
+        # Perform scraping (waits for a free slot when at capacity)
+        async with scrape_semaphore:
+            result_data = await scraper.scrape_product_and_reviews(
+                url=str(request.url),
+                max_reviews=request.target_reviews
+            )
         
         if not result_data or not result_data.get('product'):
-            jobs[job_id].status = "failed"
-            jobs[job_id].error = "No product data returned"
-            jobs[job_id].completed_at = datetime.now()
+            update_job(
+                job_id,
+                status="failed",
+                error="No product data returned",
+                completed_at=datetime.now()
+            )
             return
         
-        # Store results (same as synchronous version)
-        product_id = None
-        if result_data.get('product'):
-            product_data = result_data['product']
-            product_data['url'] = str(request.url)
-            product_id = sqlite_handler.save_product(product_data)
-        
-        review_ids = []
-        if result_data.get('reviews') and product_id:
-            # save_reviews expects a list and product_id
-            num_saved = sqlite_handler.save_reviews(result_data['reviews'], product_id)
-            # Generate placeholder review IDs since save_reviews returns count
-            review_ids = list(range(num_saved))
+        # Store product and reviews in a single transaction (same as synchronous version)
+        product_data = result_data['product']
+        product_data['url'] = str(request.url)
+        product_id, num_saved = await run_db(
+            sqlite_handler.save_product_with_reviews,
+            product_data, result_data.get('reviews') or []
+        )
+        # Generate placeholder review IDs since save_reviews returns count
+        review_ids = list(range(num_saved))
         
         scraping_time = (datetime.now() - start_time).total_seconds()
         
-        # Store analytics data in DuckDB
+        # Queue analytics data for bulk insert into DuckDB
         if product_id:
-            duckdb_handler.insert_analytics_data({
+            await queue_analytics({
                 'product_id': product_id,
                 'total_reviews': len(review_ids),
                 'scraping_method': request.method,
@@ -373,33 +626,29 @@ async def run_background_scrape(job_id: str, request: ScrapeRequest):
                 **result_data['product']
             )
         
-        review_responses = []
-        if result_data.get('reviews'):
-            for i, review_data in enumerate(result_data['reviews']):
-                review_responses.append(ReviewResponse(
-                    id=review_ids[i] if i < len(review_ids) else None,
-                    product_id=product_id,
-                    **review_data
-                ))
+        review_responses = build_review_responses(
+            result_data.get('reviews') or [], review_ids, product_id
+        )
         
         # Update job with results
-        jobs[job_id].status = "completed"
-        jobs[job_id].completed_at = datetime.now()
-        jobs[job_id].result = ScrapeResponse(
-            success=True,
-            product=product_response,
-            reviews=review_responses,
-            total_reviews=len(review_responses),
-            scraping_time=scraping_time,
-            method_used=request.method,
-            message=f"Successfully scraped {len(review_responses)} reviews"
+        update_job(
+            job_id,
+            status="completed",
+            completed_at=datetime.now(),
+            result=ScrapeResponse(
+                success=True,
+                product=product_response,
+                reviews=review_responses,
+                total_reviews=len(review_responses),
+                scraping_time=scraping_time,
+                method_used=request.method,
+                message=f"Successfully scraped {len(review_responses)} reviews"
+            )
         )
         
     except Exception as e:
         logger.error(f"Background scraping error: {e}")
-        jobs[job_id].status = "failed"
-        jobs[job_id].error = str(e)
-        jobs[job_id].completed_at = datetime.now()
+        update_job(job_id, status="failed", error=str(e), completed_at=datetime.now())
 
 @app.get("/jobs/{job_id}", response_model=JobStatus, summary="Check Job Status")
 async def get_job_status(job_id: str = Path(..., description="Job ID")):
@@ -415,10 +664,7 @@ async def list_jobs(
     limit: int = Query(50, ge=1, le=200, description="Number of jobs to return")
 ):
     """List background scraping jobs with optional filtering"""
-    filtered_jobs = list(jobs.values())
-    
-    if status:
-        filtered_jobs = [job for job in filtered_jobs if job.status == status]
+    filtered_jobs = jobs.by_status(status) if status else jobs.values()
     
     # Sort by creation time (newest first)
     filtered_jobs.sort(key=lambda x: x.created_at, reverse=True)
@@ -436,8 +682,8 @@ async def get_products(
 ):
     """Get list of scraped products from database"""
     try:
-        products = sqlite_handler.get_products(limit=limit, offset=offset)
-        total = sqlite_handler.get_products_count()
+        products = await run_db(sqlite_handler.get_products, limit=limit, offset=offset)
+        total = await run_db(sqlite_handler.get_products_count)
         
         return {
             "products": products,
@@ -453,11 +699,11 @@ async def get_products(
 async def get_product(product_id: int = Path(..., description="Product ID")):
     """Get a specific product and its reviews"""
     try:
-        product = sqlite_handler.get_product(product_id)
+        product = await run_db(sqlite_handler.get_product, product_id)
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        reviews = sqlite_handler.get_reviews_by_product(product_id)
+        reviews = await run_db(sqlite_handler.get_reviews_by_product, product_id)
         
         return {
             "product": product,
@@ -478,14 +724,14 @@ async def get_product_reviews(
     """Get reviews for a specific product"""
     try:
         # Check if product exists
-        product = sqlite_handler.get_product(product_id)
+        product = await run_db(sqlite_handler.get_product, product_id)
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        reviews = sqlite_handler.get_reviews_by_product(
-            product_id, limit=limit, offset=offset
+        reviews = await run_db(
+            sqlite_handler.get_reviews_by_product, product_id, limit=limit, offset=offset
         )
-        total = sqlite_handler.get_reviews_count_by_product(product_id)
+        total = await run_db(sqlite_handler.get_reviews_count_by_product, product_id)
         
         return {
             "product_id": product_id,
@@ -504,7 +750,8 @@ async def get_product_reviews(
 async def get_analytics_summary():
     """Get analytics summary from DuckDB"""
     try:
-        summary = duckdb_handler.get_analytics_summary()
+        await run_db(duckdb_handler.insert_analytics_batch, drain_analytics_queue())
+        summary = await run_db(duckdb_handler.get_analytics_summary)
         return summary
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analytics error: {str(e)}")
@@ -528,16 +775,13 @@ async def delete_job(job_id: str = Path(..., description="Job ID")):
 @app.delete("/jobs", summary="Clean Up Jobs")
 async def cleanup_jobs():
     """Clean up completed and failed jobs"""
-    global jobs
-    initial_count = len(jobs)
+    cleaned_count = 0
     
     # Keep only pending and running jobs
-    jobs = {
-        job_id: job for job_id, job in jobs.items() 
-        if job.status in ["pending", "running"]
-    }
-    
-    cleaned_count = initial_count - len(jobs)
+    for job_id, job in jobs.items():
+        if job.status not in ["pending", "running"]:
+            del jobs[job_id]
+            cleaned_count += 1
     
     return {
         "message": f"Cleaned up {cleaned_count} jobs",
@@ -561,7 +805,7 @@ async def load_amazon_dataset(
             raise HTTPException(status_code=500, detail="Large scale analyzer not initialized")
         
         # Check if dataset needs to be downloaded
-        dataset_available = large_scale_analyzer.download_and_prepare_dataset()
+        dataset_available = await run_db(large_scale_analyzer.download_and_prepare_dataset)
         
         if dataset_path:
             large_scale_analyzer.dataset_path = dataset_path
@@ -600,29 +844,33 @@ async def load_amazon_dataset(
 async def load_dataset_background(job_id: str, analyzer: LargeScaleAnalyzer):
     """Load dataset in background"""
     try:
-        jobs[job_id].status = "running"
+        update_job(job_id, status="running")
         
         # Load dataset with optimizations
-        success = analyzer.load_dataset_optimized()
+        success = await run_db(analyzer.load_dataset_optimized)
         
         if success:
-            jobs[job_id].status = "completed"
-            jobs[job_id].result = {
-                "success": True,
-                "message": "Dataset loaded successfully",
-                "dataset_path": analyzer.dataset_path
-            }
+            update_job(
+                job_id,
+                status="completed",
+                completed_at=datetime.now(),
+                result={
+                    "success": True,
+                    "message": "Dataset loaded successfully",
+                    "dataset_path": analyzer.dataset_path
+                }
+            )
         else:
-            jobs[job_id].status = "failed"
-            jobs[job_id].error = "Failed to load dataset"
-            
-        jobs[job_id].completed_at = datetime.now()
+            update_job(
+                job_id,
+                status="failed",
+                error="Failed to load dataset",
+                completed_at=datetime.now()
+            )
         
     except Exception as e:
         logger.error(f"Background dataset loading error: {e}")
-        jobs[job_id].status = "failed"
-        jobs[job_id].error = str(e)
-        jobs[job_id].completed_at = datetime.now()
+        update_job(job_id, status="failed", error=str(e), completed_at=datetime.now())
 
 @app.post("/analytics/run-comprehensive-analysis", summary="Run Large-Scale Category Analysis")
 async def run_comprehensive_analysis(
@@ -674,30 +922,141 @@ async def run_analysis_background(job_id: str, analyzer: LargeScaleAnalyzer,
                                 export_results: bool, cache_results: bool):
     """Run comprehensive analysis in background"""
     try:
-        jobs[job_id].status = "running"
+        update_job(job_id, status="running")
         
         # Run comprehensive analysis
-        results = analyzer.run_comprehensive_analysis(cache_results=cache_results)
+        results = await run_db(analyzer.run_comprehensive_analysis, cache_results=cache_results)
         
         if "error" in results:
-            jobs[job_id].status = "failed"
-            jobs[job_id].error = results["error"]
+            update_job(
+                job_id,
+                status="failed",
+                error=results["error"],
+                completed_at=datetime.now()
+            )
         else:
             # Export results if requested
             if export_results:
-                exported_files = analyzer.export_results(results)
+                exported_files = await run_db(analyzer.export_results, results)
                 results["exported_files"] = exported_files
             
-            jobs[job_id].status = "completed"
-            jobs[job_id].result = results
-            
-        jobs[job_id].completed_at = datetime.now()
+            update_job(
+                job_id,
+                status="completed",
+                result=results,
+                completed_at=datetime.now()
+            )
         
     except Exception as e:
         logger.error(f"Background analysis error: {e}")
-        jobs[job_id].status = "failed"
-        jobs[job_id].error = str(e)
-        jobs[job_id].completed_at = datetime.now()
+        update_job(job_id, status="failed", error=str(e), completed_at=datetime.now())
+
+# Analytics responses cached per loaded dataset version
+analytics_cache: Dict[str, Any] = {}
+
+async def cached_analytics(key: str, compute):
+    """Return a cached analytics response, recomputing after a new dataset load"""
+    version = large_scale_analyzer.dataset_version if large_scale_analyzer else 0
+    cached = analytics_cache.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    value = await run_db(compute)
+    analytics_cache[key] = (version, value)
+    return value
+
+def compute_quick_analysis() -> Dict[str, Any]:
+    """Build the quick analysis summary from the current dataset"""
+    # Check if data exists (own cursor: this runs on a DB pool thread)
+    conn = duckdb_handler.cursor()
+    try:
+        row_count = conn.execute("SELECT COUNT(*) FROM amazon_products").fetchone()[0]
+    finally:
+        conn.close()
+    
+    if row_count == 0:
+        return {
+            "message": "No data loaded. Use /analytics/load-amazon-dataset first",
+            "dataset_size": 0
+        }
+    
+    # Get quick insights
+    category_analysis = duckdb_handler.get_category_analysis()
+    statistical_insights = duckdb_handler.get_statistical_insights()
+    
+    # Return summary
+    return get_analysis_summary({
+        "analysis_metadata": {
+            "dataset_size": row_count,
+            "categories_analyzed": len(category_analysis),
+            "timestamp": datetime.now().isoformat()
+        },
+        "performance_summary": {
+            "top_performing_categories": category_analysis.head(3).to_dict('records') if not category_analysis.empty else []
+        },
+        "key_findings": [
+            f"Analyzing {row_count:,} products across {len(category_analysis)} categories",
+            f"Overall average rating: {statistical_insights.get('overall_average_rating', 0):.2f}",
+            f"High-rated products: {statistical_insights.get('quality_distribution', {}).get('high_rated_percentage', 0):.1f}%"
+        ]
+    })
+
+def compute_dataset_info() -> Dict[str, Any]:
+    """Build the dataset information response"""
+    # Own cursor: this runs on a DB pool thread
+    conn = duckdb_handler.cursor()
+    try:
+        # One scan: per-category counts plus a grand-total row (is_total = 1) via GROUPING SETS
+        rows = conn.execute("""
+            SELECT 
+                GROUPING(category) as is_total,
+                category,
+                COUNT(*) as total_products,
+                COUNT(DISTINCT category) as unique_categories,
+                COUNT(*) FILTER (WHERE rating IS NOT NULL AND rating > 0) as products_with_ratings,
+                MIN(rating) as min_rating,
+                MAX(rating) as max_rating,
+                AVG(rating) as avg_rating
+            FROM amazon_products
+            GROUP BY GROUPING SETS ((category), ())
+        """).fetchall()
+    finally:
+        conn.close()
+    
+    dataset_info = next((row[2:] for row in rows if row[0] == 1), None)
+    
+    if not dataset_info or dataset_info[0] == 0:
+        return {
+            "message": "No dataset loaded",
+            "dataset_loaded": False,
+            "total_products": 0
+        }
+    
+    # Top categories come from the per-category rows of the same scan
+    top_categories = sorted(
+        ((row[1], row[2]) for row in rows if row[0] == 0 and row[1] is not None),
+        key=lambda cat: cat[1],
+        reverse=True
+    )[:10]
+    
+    return {
+        "dataset_loaded": True,
+        "total_products": dataset_info[0],
+        "unique_categories": dataset_info[1],
+        "products_with_ratings": dataset_info[2],
+        "rating_stats": {
+            "min": dataset_info[3],
+            "max": dataset_info[4], 
+            "average": round(dataset_info[5], 2) if dataset_info[5] else None
+        },
+        "top_categories": [
+            {"category": cat[0], "product_count": cat[1]} 
+            for cat in top_categories
+        ],
+        "data_completeness": {
+            "rating_completeness": round((dataset_info[2] / dataset_info[0]) * 100, 1) if dataset_info[0] > 0 else 0
+        }
+    }
 
 @app.get("/analytics/quick-analysis", summary="Get Quick Analysis Summary")
 async def get_quick_analysis():
@@ -710,37 +1069,10 @@ async def get_quick_analysis():
         if not duckdb_handler:
             raise HTTPException(status_code=500, detail="DuckDB handler not initialized")
         
-        # Check if data exists
-        conn = duckdb_handler.connect()
-        row_count = conn.execute("SELECT COUNT(*) FROM amazon_products").fetchone()[0]
-        
-        if row_count == 0:
-            return {
-                "message": "No data loaded. Use /analytics/load-amazon-dataset first",
-                "dataset_size": 0
-            }
-        
-        # Get quick insights
-        category_analysis = duckdb_handler.get_category_analysis()
-        statistical_insights = duckdb_handler.get_statistical_insights()
-        
-        # Return summary
-        return get_analysis_summary({
-            "analysis_metadata": {
-                "dataset_size": row_count,
-                "categories_analyzed": len(category_analysis),
-                "timestamp": datetime.now().isoformat()
-            },
-            "performance_summary": {
-                "top_performing_categories": category_analysis.head(3).to_dict('records') if not category_analysis.empty else []
-            },
-            "key_findings": [
-                f"Analyzing {row_count:,} products across {len(category_analysis)} categories",
-                f"Overall average rating: {statistical_insights.get('overall_average_rating', 0):.2f}",
-                f"High-rated products: {statistical_insights.get('quality_distribution', {}).get('high_rated_percentage', 0):.1f}%"
-            ]
-        })
+        return await cached_analytics("quick_analysis", compute_quick_analysis)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in quick analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -752,56 +1084,10 @@ async def get_dataset_info():
         if not duckdb_handler:
             raise HTTPException(status_code=500, detail="DuckDB handler not initialized")
         
-        conn = duckdb_handler.connect()
-        
-        # Get basic dataset info
-        dataset_info = conn.execute("""
-            SELECT 
-                COUNT(*) as total_products,
-                COUNT(DISTINCT category) as unique_categories,
-                COUNT(*) FILTER (WHERE rating IS NOT NULL AND rating > 0) as products_with_ratings,
-                MIN(rating) as min_rating,
-                MAX(rating) as max_rating,
-                AVG(rating) as avg_rating
-            FROM amazon_products
-        """).fetchone()
-        
-        if not dataset_info or dataset_info[0] == 0:
-            return {
-                "message": "No dataset loaded",
-                "dataset_loaded": False,
-                "total_products": 0
-            }
-        
-        # Get top categories
-        top_categories = conn.execute("""
-            SELECT category, COUNT(*) as count
-            FROM amazon_products 
-            WHERE category IS NOT NULL
-            GROUP BY category 
-            ORDER BY count DESC 
-            LIMIT 10
-        """).fetchall()
-        
-        return {
-            "dataset_loaded": True,
-            "total_products": dataset_info[0],
-            "unique_categories": dataset_info[1],
-            "products_with_ratings": dataset_info[2],
-            "rating_stats": {
-                "min": dataset_info[3],
-                "max": dataset_info[4], 
-                "average": round(dataset_info[5], 2) if dataset_info[5] else None
-            },
-            "top_categories": [
-                {"category": cat[0], "product_count": cat[1]} 
-                for cat in top_categories
-            ],
-            "data_completeness": {
-                "rating_completeness": round((dataset_info[2] / dataset_info[0]) * 100, 1) if dataset_info[0] > 0 else 0
-            }
-        }
+        return await cached_analytics("dataset_info", compute_dataset_info)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting dataset info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -811,12 +1097,12 @@ async def get_dataset_info():
 async def general_exception_handler(request, exc):
     """Handle general exceptions"""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
             "type": "internal_error",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     )
 
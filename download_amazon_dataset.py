@@ -1,5 +1,3 @@
-import kagglehub
-
 #!/usr/bin/env python3
 """
 Download Amazon UK Products Dataset 2023 using kagglehub
@@ -10,8 +8,20 @@ import os
 import shutil
 from pathlib import Path
 
-def download_amazon_dataset():
-    """Download Amazon UK dataset using kagglehub"""
+try:
+    from src.storage.duckdb_handler import convert_csv_to_parquet
+except ImportError:
+    convert_csv_to_parquet = None
+
+# Where the analyzers look for the dataset first
+DATASET_CSV = os.path.join("data", "amazon-uk-products-dataset-2023.csv")
+
+def download_amazon_dataset(force: bool = False):
+    """Download Amazon UK dataset using kagglehub (skipped if it is already in data/)"""
+    if os.path.exists(DATASET_CSV) and not force:
+        print(f"Dataset already present at {DATASET_CSV}, skipping download")
+        return os.path.dirname(DATASET_CSV)
+    
     try:
         print("Downloading Amazon UK Products Dataset 2023...")
         
@@ -33,12 +43,27 @@ def download_amazon_dataset():
                 if file.endswith('.csv'):
                     src = os.path.join(path, file)
                     dst = os.path.join(data_dir, file)
-                    shutil.copy2(src, dst)
-                    print(f"Copied {file} to {dst}")
+                    
+                    # Hard-link out of the kagglehub cache when on the same filesystem (no data copied)
+                    if os.path.exists(dst):
+                        os.remove(dst)
+                    try:
+                        os.link(src, dst)
+                        print(f"Linked {file} to {dst}")
+                    except OSError:
+                        shutil.copy2(src, dst)
+                        print(f"Copied {file} to {dst}")
                     
                     # Get file size for validation
-                    size_mb = os.path.getsize(dst) / (1024 * 1024)
+                    size_mb = os.stat(dst).st_size / (1024 * 1024)
                     print(f"File size: {size_mb:.1f} MB")
+                    
+                    # Convert once to Parquet so later loads skip CSV parsing
+                    if convert_csv_to_parquet:
+                        parquet_path = convert_csv_to_parquet(dst)
+                        if parquet_path:
+                            parquet_mb = os.path.getsize(parquet_path) / (1024 * 1024)
+                            print(f"Converted to {parquet_path} ({parquet_mb:.1f} MB)")
         
         return path
         
@@ -47,9 +72,5 @@ def download_amazon_dataset():
         return None
 
 if __name__ == "__main__":
-    # Download latest version
-    path = kagglehub.dataset_download("asaniczka/amazon-uk-products-dataset-2023")
-    print("Path to dataset files:", path)
-    
     # Run the download function
     download_amazon_dataset()
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for running the FastAPI app in production
+Usage: gunicorn api.main:app -c gunicorn_conf.py
+"""
+import os
+
+# Server socket
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Worker processes. Defaults to one: DuckDB allows a single writer process per
+# database file, so extra workers could not open analytics.duckdb. Raise
+# WEB_CONCURRENCY only with REDIS_URL set and without the DuckDB analytics endpoints
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Timeouts (seconds)
+keepalive = int(os.getenv("KEEPALIVE", "30"))
+timeout = int(os.getenv("TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+
+# Logging
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = "-"
+errorlog = "-"
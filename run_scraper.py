@@ -1,14 +1,13 @@
 """
 Simple runner script for the Newegg web scraper
 """
-import asyncio
 import sys
 import os
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.main import main
+from src.main import run
 
 if __name__ == "__main__":
     # Default configuration for quick testing
@@ -27,4 +26,4 @@ if __name__ == "__main__":
         print()
     
     # Run the main application
-    asyncio.run(main())
+    run()
@@ -1,15 +1,31 @@
 """
 Analysis package initialization
+CategoryAnalyzer is imported on first access so `import src.analysis` stays cheap
 """
-try:
-    from .category_analyzer import CategoryAnalyzer, run_category_analysis
-    ANALYSIS_AVAILABLE = True
-except ImportError:
-    CategoryAnalyzer = None
-    run_category_analysis = None
-    ANALYSIS_AVAILABLE = False
+import importlib.util
 
-__all__ = []
+__all__ = ['CategoryAnalyzer', 'run_category_analysis']
 
-if ANALYSIS_AVAILABLE:
-    __all__.extend(['CategoryAnalyzer', 'run_category_analysis'])
+
+def __getattr__(name):
+    """Import the analysis classes lazily (PEP 562)"""
+    if name not in ('CategoryAnalyzer', 'run_category_analysis', 'ANALYSIS_AVAILABLE'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    try:
+        from .category_analyzer import CategoryAnalyzer, run_category_analysis
+        # The analyzer imports DuckDB lazily, so check that it is installed here
+        available = importlib.util.find_spec("duckdb") is not None
+    except ImportError:
+        available = False
+    
+    if not available:
+        CategoryAnalyzer = None
+        run_category_analysis = None
+    
+    globals().update(
+        CategoryAnalyzer=CategoryAnalyzer,
+        run_category_analysis=run_category_analysis,
+        ANALYSIS_AVAILABLE=available,
+    )
+    return globals()[name]
@@ -2,14 +2,16 @@
 Category-based analysis for Amazon UK products dataset (Bonus Challenge)
 """
 import os
+import asyncio
 import logging
-import requests
-import zipfile
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
+from operator import itemgetter
+from urllib.parse import urlsplit
 
-from ..storage.duckdb_handler import DuckDBHandler
+if TYPE_CHECKING:
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +19,22 @@ class CategoryAnalyzer:
     """Category-based product analysis using DuckDB"""
     
     def __init__(self, duckdb_path: str = "data/analytics.duckdb"):
+        # DuckDB and pandas are only imported once an analyzer is created
+        from ..storage.duckdb_handler import DuckDBHandler
+        
         self.duckdb_handler = DuckDBHandler(duckdb_path)
         self.dataset_url = "https://www.kaggle.com/datasets/asaniczka/amazon-uk-products-dataset-2023"
         self.dataset_path = "data/amazon-uk-products-dataset-2023.csv"
+        self._io_pool: Optional[ThreadPoolExecutor] = None  # Background report/export writer
+        self.pending_writes: Optional[Future] = None  # Completes once output files are written
     
-    def download_dataset(self) -> bool:
+    def download_dataset(self, urls: Optional[List[str]] = None) -> bool:
         """
         Download Amazon UK dataset from Kaggle
         Note: This requires Kaggle API setup or manual download
+        
+        Args:
+            urls: Optional direct file URLs (e.g. a mirror) fetched concurrently if no local copy exists
         """
         logger.info("Dataset download instructions:")
         logger.info("1. Go to: https://www.kaggle.com/datasets/asaniczka/amazon-uk-products-dataset-2023")
@@ -51,9 +61,54 @@ class CategoryAnalyzer:
                 self.dataset_path = path
                 return True
         
+        if urls:
+            downloaded = asyncio.run(self._fetch_files(urls))
+            csv_files = [path for path in downloaded if path.endswith('.csv')]
+            if csv_files:
+                self.dataset_path = csv_files[0]
+                return True
+        
         logger.warning("Dataset not found. Please download manually.")
         return False
     
+    async def _fetch_files(self, urls: List[str], data_dir: str = "data") -> List[str]:
+        """Download files concurrently over one pooled aiohttp session"""
+        import aiohttp
+        
+        os.makedirs(data_dir, exist_ok=True)
+        connector = aiohttp.TCPConnector(limit=16)
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=300)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(self._fetch_file(session, url, data_dir) for url in urls),
+                return_exceptions=True
+            )
+        
+        paths = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to download {url}: {result}")
+            else:
+                paths.append(result)
+        return paths
+    
+    async def _fetch_file(self, session: "aiohttp.ClientSession", url: str, data_dir: str) -> str:
+        """Stream one file to disk in 1 MB chunks"""
+        filename = os.path.basename(urlsplit(url).path) or "dataset.csv"
+        dest = os.path.join(data_dir, filename)
+        partial = dest + ".part"
+        
+        async with session.get(url) as response:
+            response.raise_for_status()
+            with open(partial, 'wb') as f:
+                async for chunk in response.content.iter_chunked(1 << 20):
+                    f.write(chunk)
+        
+        os.replace(partial, dest)
+        logger.info(f"Downloaded {url} to {dest}")
+        return dest
+    
     def load_dataset(self) -> bool:
         """Load the Amazon UK dataset into DuckDB"""
         if not os.path.exists(self.dataset_path):
@@ -80,29 +135,35 @@ class CategoryAnalyzer:
         logger.info("Starting category-based analysis...")
         
         try:
-            # Get category statistics
-            category_stats = self.duckdb_handler.get_category_analysis()
+            # Insights and rating distribution scan amazon_products on their own cursors,
+            # overlapping with the category stats query (DuckDB releases the GIL)
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                insights_future = pool.submit(self.duckdb_handler.get_statistical_insights)
+                distribution_future = pool.submit(self.duckdb_handler.get_rating_distribution)
+                
+                # Get category statistics as row dicts (no DataFrame round-trip)
+                category_stats = self.duckdb_handler.get_category_analysis_records()
+                
+                insights = insights_future.result()
+                rating_distribution = distribution_future.result()
             
-            if category_stats.empty:
+            if not category_stats:
                 logger.warning("No data available for analysis")
                 return {"error": "No data available"}
             
-            # Get statistical insights
-            insights = self.duckdb_handler.get_statistical_insights()
-            
-            # Get rating distribution
-            rating_distribution = self.duckdb_handler.get_rating_distribution()
-            
-            # Generate summary
-            summary = self._generate_analysis_summary(category_stats, insights)
+            # Summary and recommendation picks in one SQL pass over the category stats
+            category_summary = self.duckdb_handler.get_category_summary(
+                insights.get("overall_average_rating", 4.0)
+            )
+            summary = self._generate_analysis_summary(category_summary, insights)
             
             results = {
                 "analysis_timestamp": datetime.now().isoformat(),
                 "summary": summary,
-                "category_statistics": category_stats.to_dict('records'),
+                "category_statistics": category_stats,
                 "statistical_insights": insights,
                 "rating_distribution": rating_distribution.to_dict('records') if not rating_distribution.empty else [],
-                "recommendations": self._generate_recommendations(category_stats, insights)
+                "recommendations": self._generate_recommendations(category_summary, insights)
             }
             
             logger.info("Category analysis completed successfully")
@@ -112,87 +173,63 @@ class CategoryAnalyzer:
             logger.error(f"Error in category analysis: {e}")
             return {"error": str(e)}
     
-    def _generate_analysis_summary(self, category_stats: pd.DataFrame, insights: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_analysis_summary(self, summary: Dict[str, Any], insights: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a summary of the analysis"""
-        if category_stats.empty:
+        if not summary.get("total_categories"):
             return {"error": "No data to summarize"}
         
-        # Find categories with highest and lowest ratings
-        highest_rated = category_stats.loc[category_stats['avg_rating'].idxmax()]
-        lowest_rated = category_stats.loc[category_stats['avg_rating'].idxmin()]
-        
-        # Find categories with highest and lowest variability
-        highest_variability = category_stats.loc[category_stats['rating_stddev'].idxmax()]
-        lowest_variability = category_stats.loc[category_stats['rating_stddev'].idxmin()]
-        
         return {
-            "total_categories_analyzed": len(category_stats),
+            "total_categories_analyzed": summary["total_categories"],
             "overall_average_rating": insights.get("overall_average_rating", 0),
             "highest_rated_category": {
-                "category": highest_rated['category'],
-                "average_rating": round(highest_rated['avg_rating'], 3),
-                "product_count": int(highest_rated['product_count'])
+                "category": summary["highest_rated_category"],
+                "average_rating": round(summary["highest_avg_rating"], 3),
+                "product_count": int(summary["highest_rated_count"])
             },
             "lowest_rated_category": {
-                "category": lowest_rated['category'],
-                "average_rating": round(lowest_rated['avg_rating'], 3),
-                "product_count": int(lowest_rated['product_count'])
+                "category": summary["lowest_rated_category"],
+                "average_rating": round(summary["lowest_avg_rating"], 3),
+                "product_count": int(summary["lowest_rated_count"])
             },
             "highest_variability_category": {
-                "category": highest_variability['category'],
-                "standard_deviation": round(highest_variability['rating_stddev'], 3),
-                "variance": round(highest_variability['rating_variance'], 3)
+                "category": summary["highest_variability_category"],
+                "standard_deviation": round(summary["highest_stddev"], 3),
+                "variance": round(summary["highest_variance"], 3)
             },
             "lowest_variability_category": {
-                "category": lowest_variability['category'],
-                "standard_deviation": round(lowest_variability['rating_stddev'], 3),
-                "variance": round(lowest_variability['rating_variance'], 3)
+                "category": summary["lowest_variability_category"],
+                "standard_deviation": round(summary["lowest_stddev"], 3),
+                "variance": round(summary["lowest_variance"], 3)
             }
         }
     
-    def _generate_recommendations(self, category_stats: pd.DataFrame, insights: Dict[str, Any]) -> List[str]:
+    def _generate_recommendations(self, summary: Dict[str, Any], insights: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on analysis"""
         recommendations = []
         
-        if category_stats.empty:
+        if not summary.get("total_categories"):
             return ["No data available for recommendations"]
         
-        # Overall rating threshold
-        overall_avg = insights.get("overall_average_rating", 4.0)
+        # High performing categories (more than 0.2 above the overall average)
+        if summary.get("high_performer"):
+            recommendations.append(f"Focus on '{summary['high_performer']}' category - consistently high ratings ({summary['high_performer_rating']:.2f})")
         
-        # High performing categories
-        high_performers = category_stats[category_stats['avg_rating'] > overall_avg + 0.2]
-        if not high_performers.empty:
-            top_category = high_performers.iloc[0]['category']
-            recommendations.append(f"Focus on '{top_category}' category - consistently high ratings ({high_performers.iloc[0]['avg_rating']:.2f})")
-        
-        # Low performing categories
-        low_performers = category_stats[category_stats['avg_rating'] < overall_avg - 0.2]
-        if not low_performers.empty:
-            bottom_category = low_performers.iloc[-1]['category']
-            recommendations.append(f"Investigate '{bottom_category}' category - below average ratings ({low_performers.iloc[-1]['avg_rating']:.2f})")
+        # Low performing categories (more than 0.2 below the overall average)
+        if summary.get("low_performer"):
+            recommendations.append(f"Investigate '{summary['low_performer']}' category - below average ratings ({summary['low_performer_rating']:.2f})")
         
         # High variability categories (inconsistent quality)
-        high_variability = category_stats[category_stats['rating_stddev'] > 1.0]
-        if not high_variability.empty:
-            variable_category = high_variability.iloc[0]['category']
-            recommendations.append(f"Review quality control for '{variable_category}' - high rating variability (σ={high_variability.iloc[0]['rating_stddev']:.2f})")
+        if summary.get("variable_category"):
+            recommendations.append(f"Review quality control for '{summary['variable_category']}' - high rating variability (σ={summary['variable_stddev']:.2f})")
         
         # Low variability categories (consistent quality)
-        low_variability = category_stats[category_stats['rating_stddev'] < 0.5]
-        if not low_variability.empty:
-            consistent_category = low_variability.iloc[0]['category']
-            recommendations.append(f"'{consistent_category}' shows consistent quality - good benchmark for other categories")
-        
-        # Z-score insights
-        z_score_analysis = insights.get("z_score_analysis", [])
-        significant_categories = [cat for cat in z_score_analysis if cat.get("significance_level") == "Significant"]
+        if summary.get("consistent_category"):
+            recommendations.append(f"'{summary['consistent_category']}' shows consistent quality - good benchmark for other categories")
         
-        for cat in significant_categories[:2]:  # Top 2 significant categories
-            if cat.get("z_score", 0) > 2:
-                recommendations.append(f"'{cat['category']}' significantly outperforms average (z-score: {cat['z_score']:.2f})")
-            elif cat.get("z_score", 0) < -2:
-                recommendations.append(f"'{cat['category']}' significantly underperforms average (z-score: {cat['z_score']:.2f})")
+        # Z-score insights (top 2 categories with |z| > 2, already filtered and sorted in SQL)
+        for cat in self.duckdb_handler.get_category_z_scores(limit=2, min_abs_z=2.0):
+            direction = "outperforms" if cat["z"] > 0 else "underperforms"
+            recommendations.append(f"'{cat['category']}' significantly {direction} average (z-score: {cat['z']:.2f})")
         
         return recommendations[:5]  # Limit to top 5 recommendations
     
@@ -201,95 +238,92 @@ class CategoryAnalyzer:
         try:
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
-            with open(output_file, 'w') as f:
-                f.write("=" * 60 + "\n")
-                f.write("AMAZON UK PRODUCTS - CATEGORY ANALYSIS REPORT\n")
-                f.write("=" * 60 + "\n\n")
+            # Assemble the report in memory and write it with a single call
+            lines = []
+            lines.append("=" * 60 + "\n")
+            lines.append("AMAZON UK PRODUCTS - CATEGORY ANALYSIS REPORT\n")
+            lines.append("=" * 60 + "\n\n")
+            
+            # Analysis timestamp
+            timestamp = results.get("analysis_timestamp", "Unknown")
+            lines.append(f"Analysis Date: {timestamp}\n\n")
+            
+            # Summary section
+            summary = results.get("summary", {})
+            if summary and "error" not in summary:
+                lines.append("EXECUTIVE SUMMARY\n")
+                lines.append("-" * 20 + "\n")
+                lines.append(f"Total Categories Analyzed: {summary.get('total_categories_analyzed', 0)}\n")
+                lines.append(f"Overall Average Rating: {summary.get('overall_average_rating', 0):.3f}\n\n")
                 
-                # Analysis timestamp
-                timestamp = results.get("analysis_timestamp", "Unknown")
-                f.write(f"Analysis Date: {timestamp}\n\n")
+                lines.append("TOP PERFORMING CATEGORY\n")
+                highest = summary.get("highest_rated_category", {})
+                lines.append(f"Category: {highest.get('category', 'N/A')}\n")
+                lines.append(f"Average Rating: {highest.get('average_rating', 0):.3f}\n")
+                lines.append(f"Product Count: {highest.get('product_count', 0):,}\n\n")
                 
-                # Summary section
-                summary = results.get("summary", {})
-                if summary and "error" not in summary:
-                    f.write("EXECUTIVE SUMMARY\n")
-                    f.write("-" * 20 + "\n")
-                    f.write(f"Total Categories Analyzed: {summary.get('total_categories_analyzed', 0)}\n")
-                    f.write(f"Overall Average Rating: {summary.get('overall_average_rating', 0):.3f}\n\n")
-                    
-                    f.write("TOP PERFORMING CATEGORY\n")
-                    highest = summary.get("highest_rated_category", {})
-                    f.write(f"Category: {highest.get('category', 'N/A')}\n")
-                    f.write(f"Average Rating: {highest.get('average_rating', 0):.3f}\n")
-                    f.write(f"Product Count: {highest.get('product_count', 0):,}\n\n")
-                    
-                    f.write("LOWEST PERFORMING CATEGORY\n")
-                    lowest = summary.get("lowest_rated_category", {})
-                    f.write(f"Category: {lowest.get('category', 'N/A')}\n")
-                    f.write(f"Average Rating: {lowest.get('average_rating', 0):.3f}\n")
-                    f.write(f"Product Count: {lowest.get('product_count', 0):,}\n\n")
-                    
-                    f.write("RATING VARIABILITY\n")
-                    f.write("-" * 20 + "\n")
-                    high_var = summary.get("highest_variability_category", {})
-                    f.write(f"Most Variable: {high_var.get('category', 'N/A')} (σ={high_var.get('standard_deviation', 0):.3f})\n")
-                    low_var = summary.get("lowest_variability_category", {})
-                    f.write(f"Most Consistent: {low_var.get('category', 'N/A')} (σ={low_var.get('standard_deviation', 0):.3f})\n\n")
+                lines.append("LOWEST PERFORMING CATEGORY\n")
+                lowest = summary.get("lowest_rated_category", {})
+                lines.append(f"Category: {lowest.get('category', 'N/A')}\n")
+                lines.append(f"Average Rating: {lowest.get('average_rating', 0):.3f}\n")
+                lines.append(f"Product Count: {lowest.get('product_count', 0):,}\n\n")
                 
-                # Recommendations
-                recommendations = results.get("recommendations", [])
-                if recommendations:
-                    f.write("KEY RECOMMENDATIONS\n")
-                    f.write("-" * 20 + "\n")
-                    for i, rec in enumerate(recommendations, 1):
-                        f.write(f"{i}. {rec}\n")
-                    f.write("\n")
+                lines.append("RATING VARIABILITY\n")
+                lines.append("-" * 20 + "\n")
+                high_var = summary.get("highest_variability_category", {})
+                lines.append(f"Most Variable: {high_var.get('category', 'N/A')} (σ={high_var.get('standard_deviation', 0):.3f})\n")
+                low_var = summary.get("lowest_variability_category", {})
+                lines.append(f"Most Consistent: {low_var.get('category', 'N/A')} (σ={low_var.get('standard_deviation', 0):.3f})\n\n")
+            
+            # Recommendations
+            recommendations = results.get("recommendations", [])
+            if recommendations:
+                lines.append("KEY RECOMMENDATIONS\n")
+                lines.append("-" * 20 + "\n")
+                for i, rec in enumerate(recommendations, 1):
+                    lines.append(f"{i}. {rec}\n")
+                lines.append("\n")
+            
+            # Statistical insights
+            insights = results.get("statistical_insights", {})
+            if insights:
+                lines.append("STATISTICAL ANALYSIS\n")
+                lines.append("-" * 20 + "\n")
+                lines.append(f"Total Products: {insights.get('total_products', 0):,}\n")
+                lines.append(f"Overall Standard Deviation: {insights.get('overall_stddev', 0):.3f}\n")
                 
-                # Statistical insights
-                insights = results.get("statistical_insights", {})
-                if insights:
-                    f.write("STATISTICAL ANALYSIS\n")
-                    f.write("-" * 20 + "\n")
-                    f.write(f"Total Products: {insights.get('total_products', 0):,}\n")
-                    f.write(f"Overall Standard Deviation: {insights.get('overall_stddev', 0):.3f}\n")
-                    
-                    z_analysis = insights.get("z_score_analysis", [])
-                    if z_analysis:
-                        f.write("\nZ-Score Analysis (Categories vs. Overall Mean):\n")
-                        for cat in z_analysis[:5]:  # Top 5
-                            significance = cat.get("significance_level", "Normal")
-                            z_score = cat.get("z_score", 0)
-                            f.write(f"  {cat.get('category', 'Unknown')}: z={z_score:.2f} ({significance})\n")
+                z_analysis = insights.get("z_score_analysis", [])
+                if z_analysis:
+                    lines.append("\nZ-Score Analysis (Categories vs. Overall Mean):\n")
+                    for cat in z_analysis[:5]:  # Top 5
+                        significance = cat.get("significance_level", "Normal")
+                        z_score = cat.get("z_score", 0)
+                        lines.append(f"  {cat.get('category', 'Unknown')}: z={z_score:.2f} ({significance})\n")
+            
+            # Category statistics table
+            category_stats = results.get("category_statistics", [])
+            if category_stats:
+                lines.append("\n" + "=" * 60 + "\n")
+                lines.append("DETAILED CATEGORY STATISTICS\n")
+                lines.append("=" * 60 + "\n")
                 
-                # Category statistics table
-                category_stats = results.get("category_statistics", [])
-                if category_stats:
-                    f.write("\n" + "=" * 60 + "\n")
-                    f.write("DETAILED CATEGORY STATISTICS\n")
-                    f.write("=" * 60 + "\n")
-                    
-                    # Header
-                    f.write(f"{'Category':<20} {'Count':<8} {'Avg':<6} {'StdDev':<8} {'Min':<6} {'Max':<6} {'High%':<8}\n")
-                    f.write("-" * 70 + "\n")
-                    
-                    # Sort by average rating
-                    sorted_stats = sorted(category_stats, key=lambda x: x.get('avg_rating', 0), reverse=True)
-                    
-                    for stat in sorted_stats:
-                        category = stat.get('category', 'Unknown')[:19]  # Truncate long names
-                        count = stat.get('product_count', 0)
-                        avg = stat.get('avg_rating', 0)
-                        stddev = stat.get('rating_stddev', 0)
-                        min_rating = stat.get('min_rating', 0)
-                        max_rating = stat.get('max_rating', 0)
-                        high_pct = stat.get('high_rating_percentage', 0)
-                        
-                        f.write(f"{category:<20} {count:<8,} {avg:<6.2f} {stddev:<8.3f} {min_rating:<6.1f} {max_rating:<6.1f} {high_pct:<8.1f}\n")
+                # Header
+                lines.append(f"{'Category':<20} {'Count':<8} {'Avg':<6} {'StdDev':<8} {'Min':<6} {'Max':<6} {'High%':<8}\n")
+                lines.append("-" * 70 + "\n")
                 
-                f.write("\n" + "=" * 60 + "\n")
-                f.write("End of Report\n")
-                f.write("=" * 60 + "\n")
+                # Rows arrive sorted by average rating (ORDER BY in the DuckDB query);
+                # fields are pulled with one itemgetter call and a prebuilt format
+                row_fields = itemgetter('category', 'product_count', 'avg_rating', 'rating_stddev',
+                                        'min_rating', 'max_rating', 'high_rating_percentage')
+                row_format = "{:<20.19} {:<8,} {:<6.2f} {:<8.3f} {:<6.1f} {:<6.1f} {:<8.1f}\n".format
+                lines.extend(row_format(*row_fields(stat)) for stat in category_stats)
+            
+            lines.append("\n" + "=" * 60 + "\n")
+            lines.append("End of Report\n")
+            lines.append("=" * 60 + "\n")
+            
+            with open(output_file, 'w') as f:
+                f.write("".join(lines))
             
             logger.info(f"Analysis report generated: {output_file}")
             return True
@@ -298,17 +332,22 @@ class CategoryAnalyzer:
             logger.error(f"Error generating report: {e}")
             return False
     
-    def run_analysis(self, generate_report: bool = True, export_csv: bool = True) -> Dict[str, Any]:
+    def run_analysis(self, generate_report: bool = True, export_csv: bool = True,
+                     dataset_urls: Optional[List[str]] = None) -> Dict[str, Any]:
         """Run the complete category analysis pipeline"""
         logger.info("Starting Amazon UK products category analysis...")
         
-        # Step 1: Check/download dataset
-        if not self.download_dataset():
-            return {"error": "Dataset not available. Please download manually."}
-        
-        # Step 2: Load dataset into DuckDB
-        if not self.load_dataset():
-            return {"error": "Failed to load dataset into DuckDB"}
+        # Steps 1-2 are skipped when DuckDB already holds the current dataset
+        if self.duckdb_handler.amazon_dataset_loaded(self.dataset_path):
+            logger.info("Dataset already loaded into DuckDB, skipping download and load")
+        else:
+            # Step 1: Check/download dataset
+            if not self.download_dataset(dataset_urls):
+                return {"error": "Dataset not available. Please download manually."}
+            
+            # Step 2: Load dataset into DuckDB
+            if not self.load_dataset():
+                return {"error": "Failed to load dataset into DuckDB"}
         
         # Step 3: Perform analysis
         results = self.perform_category_analysis()
@@ -316,16 +355,6 @@ class CategoryAnalyzer:
         if "error" in results:
             return results
         
-        # Step 4: Generate report
-        if generate_report:
-            self.generate_insights_report(results)
-        
-        # Step 5: Export CSV files
-        if export_csv:
-            self.duckdb_handler.export_analysis_results()
-        
-        logger.info("Category analysis completed successfully!")
-        
         # Add file paths to results
         results["output_files"] = {
             "report": "data/analysis_report.txt",
@@ -334,10 +363,39 @@ class CategoryAnalyzer:
             "statistical_insights": "data/analysis_results/statistical_insights.json"
         }
         
+        # Steps 4-5: Write the report and CSV exports in the background
+        if generate_report or export_csv:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=1)
+            self.pending_writes = self._io_pool.submit(
+                self._write_outputs, results, generate_report, export_csv
+            )
+        
+        logger.info("Category analysis completed successfully!")
         return results
     
+    def _write_outputs(self, results: Dict[str, Any], generate_report: bool, export_csv: bool):
+        """
+        Write the insights report and CSV/JSON exports (runs on the I/O thread)
+        Both are written from the same in-memory results, so DuckDB isn't queried again
+        """
+        if generate_report:
+            self.generate_insights_report(results)
+        
+        if export_csv:
+            self.duckdb_handler.export_analysis_results(
+                category_stats=results.get("category_statistics", []),
+                rating_distribution=results.get("rating_distribution", []),
+                insights=results.get("statistical_insights", {})
+            )
+    
     def cleanup(self):
         """Clean up resources"""
+        # Let pending report/export writes finish before closing DuckDB
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+        
         if self.duckdb_handler:
             self.duckdb_handler.close()
 
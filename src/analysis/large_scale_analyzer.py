@@ -7,70 +7,74 @@ Designed for scalability and dashboard integration
 """
 
 import os
+import gzip
+import hashlib
 import logging
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
-# Handle pandas import gracefully
+# orjson serializes the large results dicts much faster; fall back to json
 try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
+    import orjson
 except ImportError:
-    PANDAS_AVAILABLE = False
-    # Create minimal DataFrame-like class for compatibility
-    class MockDataFrame:
-        def __init__(self, data=None):
-            self.data = data or []
-        def empty(self): return len(self.data) == 0
-        def to_dict(self, orient='records'): return self.data if isinstance(self.data, list) else []
-        def head(self, n=5): return MockDataFrame(self.data[:n] if isinstance(self.data, list) else [])
-        def tail(self, n=5): return MockDataFrame(self.data[-n:] if isinstance(self.data, list) else [])
-        def iloc(self, index): 
-            if isinstance(self.data, list) and 0 <= index < len(self.data):
-                return self.data[index]
-            return {}
-        def __len__(self): return len(self.data) if isinstance(self.data, list) else 0
-        def __getitem__(self, key): return self.data
-        def nlargest(self, n, col): return MockDataFrame(self.data[:n] if isinstance(self.data, list) else [])
-        def nsmallest(self, n, col): return MockDataFrame(self.data[:n] if isinstance(self.data, list) else [])
-    
-    pd = type('MockPandas', (), {'DataFrame': MockDataFrame})()
+    orjson = None
 
-from ..storage.duckdb_handler import DuckDBHandler
+from ..storage.duckdb_handler import DuckDBHandler, convert_csv_to_parquet
+from ..storage.serialization import json_default, to_json_types
 
 logger = logging.getLogger(__name__)
 
-def safe_dataframe_operation(df, operation, *args, **kwargs):
-    """Safely handle DataFrame operations with fallback for when pandas is not available"""
-    if PANDAS_AVAILABLE and hasattr(df, operation):
-        attr = getattr(df, operation)
-        if callable(attr):
-            return attr(*args, **kwargs)
-        else:
-            return attr
+# Rows sampled by validate_dataset for the data quality checks
+VALIDATION_SAMPLE_ROWS = 50000
+
+# Write buffer for exported result files
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Executive summary row template, applied to each top category dict
+_TOP_CATEGORY_LINE = "• {category}: {avg_rating:.2f} avg rating ({product_count:,} products)\n".format_map
+
+@contextmanager
+def _atomic_open(path: str, mode: str = 'w'):
+    """
+    Open a temp file next to path with a 1 MiB buffer and rename it over path on success,
+    so dashboard pollers never read a half-written export
+    """
+    partial = path + ".tmp"
+    try:
+        with open(partial, mode, buffering=EXPORT_BUFFER_SIZE) as f:
+            yield f
+            f.flush()
+            # Write-once files: drop them from the page cache (Linux only)
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        os.replace(partial, path)
+    except BaseException:
+        try:
+            os.remove(partial)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _write_json(path: str, data: Any):
+    """Write data as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        with _atomic_open(path, 'wb') as f:
+            f.write(orjson.dumps(data, default=json_default, option=options))
     else:
-        # Fallback for basic operations
-        if operation == 'empty':
-            return len(df) == 0 if hasattr(df, '__len__') else True
-        elif operation == 'to_dict':
-            return df if isinstance(df, list) else []
-        elif operation == 'head':
-            n = args[0] if args else 5
-            return df[:n] if isinstance(df, list) else []
-        elif operation == 'tail':
-            n = args[0] if args else 5
-            return df[-n:] if isinstance(df, list) else []
-        elif operation == 'iloc':
-            if isinstance(df, list) and args:
-                idx = args[0]
-                if isinstance(idx, int) and 0 <= idx < len(df):
-                    return df[idx]
-        elif operation in ['nlargest', 'nsmallest']:
-            # For sorting operations, return the data as-is
-            return df[:args[0]] if isinstance(df, list) and args else df
-        return df
+        with _atomic_open(path) as f:
+            f.write(json.dumps(to_json_types(data), indent=2))
+
+def _dumps_compact(data: Any) -> bytes:
+    """Serialize data as compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(to_json_types(data)).encode()
 
 class LargeScaleAnalyzer:
     """
@@ -78,10 +82,60 @@ class LargeScaleAnalyzer:
     Optimized for 2+ million rows with scalable query design
     """
     
-    def __init__(self, duckdb_path: str = "data/analytics.duckdb"):
-        self.duckdb_handler = DuckDBHandler(duckdb_path)
+    def __init__(self, duckdb_path: str = "data/analytics.duckdb",
+                 duckdb_handler: Optional[DuckDBHandler] = None):
+        # Share the caller's handler when given, so its result caches see our reloads
+        self.duckdb_handler = duckdb_handler or DuckDBHandler(duckdb_path)
+        self._owns_handler = duckdb_handler is None
+        duckdb_path = self.duckdb_handler.db_path
         self.dataset_path = None
         self.analysis_cache = {}
+        self.dataset_version = 0  # Bumped on every successful load
+        # Comprehensive results persisted across restarts, keyed by the loaded dataset file
+        self.analysis_cache_dir = os.path.join(os.path.dirname(duckdb_path), ".analysis_cache")
+    
+    def _analysis_cache_path(self) -> Optional[str]:
+        """Persisted results file for the dataset currently in amazon_products, if known"""
+        # Source file path and mtime recorded by the load that filled the table
+        fingerprint = self.duckdb_handler.loaded_source()
+        if not fingerprint:
+            return None
+        
+        key = hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest()
+        return os.path.join(self.analysis_cache_dir, f"{key}.json.gz")
+    
+    def _load_persisted_analysis(self, path: str) -> Optional[Dict[str, Any]]:
+        """Read persisted comprehensive results, or None when missing or unreadable"""
+        try:
+            with gzip.open(path, 'rb') as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable analysis cache {path}: {e}")
+            return None
+    
+    def _persist_analysis(self, path: str, results: Dict[str, Any]):
+        """Write comprehensive results as gzip-compressed JSON, replacing older ones"""
+        try:
+            os.makedirs(self.analysis_cache_dir, exist_ok=True)
+            partial = path + ".part"
+            with gzip.open(partial, 'wb', compresslevel=3) as f:
+                f.write(_dumps_compact(results))
+            os.replace(partial, path)
+            
+            # Only the latest dataset's results are kept
+            for name in os.listdir(self.analysis_cache_dir):
+                stale = os.path.join(self.analysis_cache_dir, name)
+                if stale != path:
+                    os.remove(stale)
+        except Exception as e:
+            logger.warning(f"Could not persist analysis cache {path}: {e}")
+    
+    def _invalidate(self):
+        """Drop cached results after amazon_products changes"""
+        self.analysis_cache.clear()
+        self.dataset_version += 1
         
     def download_and_prepare_dataset(self, force_download: bool = False) -> bool:
         """
@@ -96,6 +150,7 @@ class LargeScaleAnalyzer:
         
         dataset_paths = [
             "data/amazon-uk-products-dataset-2023.csv",
+            "data/amazon-uk-products-dataset-2023.parquet",
             "amazon-uk-products-dataset-2023.csv",
             "data/amazon_uk_products.csv"
         ]
@@ -103,7 +158,9 @@ class LargeScaleAnalyzer:
         # Check for existing dataset
         for path in dataset_paths:
             if os.path.exists(path) and not force_download:
-                logger.info(f"Found existing dataset at {path}")
+                logger.info("Found existing dataset at %s", path)
+                # A CSV is converted to Parquet by load_dataset_optimized, which runs
+                # as a background job, not here
                 self.dataset_path = path
                 return True
         
@@ -140,39 +197,49 @@ class LargeScaleAnalyzer:
         Returns:
             Dict containing validation results and recommendations
         """
+        conn = None
         try:
-            # Quick validation using DuckDB's efficient CSV reader
-            conn = self.duckdb_handler.connect()
+            # Quick validation using DuckDB's efficient CSV reader, on its own cursor
+            conn = self.duckdb_handler.cursor()
+            source, source_params = self.duckdb_handler.dataset_source(csv_path)
+            
+            # Exact row count (answered from the footer metadata for Parquet)
+            total_rows = conn.execute(f"SELECT COUNT(*) FROM {source}", source_params).fetchone()[0]
             
-            # Sample first 1000 rows for validation
+            # Quality metrics from a reservoir sample instead of a full scan
             validation_query = f"""
             SELECT 
-                COUNT(*) as total_rows,
+                COUNT(*) as sampled_rows,
                 COUNT(DISTINCT COALESCE(category, 'Unknown')) as unique_categories,
                 COUNT(*) FILTER (WHERE rating IS NOT NULL AND rating > 0) as valid_ratings,
                 MIN(rating) as min_rating,
                 MAX(rating) as max_rating,
                 COUNT(*) FILTER (WHERE category IS NULL OR category = '') as missing_categories,
                 COUNT(DISTINCT title) as unique_products
-            FROM read_csv_auto('{csv_path}', sample_size=50000)
+            FROM {source}
+            USING SAMPLE {VALIDATION_SAMPLE_ROWS} ROWS
             """
             
-            stats = conn.execute(validation_query).fetchone()
+            stats = conn.execute(validation_query, source_params).fetchone()
+            sampled_rows = stats[0] if stats else 0
+            # Counts from the sample are scaled up to estimates for the whole file
+            scale = total_rows / sampled_rows if sampled_rows else 0
             
             validation_result = {
                 "file_path": csv_path,
                 "validation_timestamp": datetime.now().isoformat(),
-                "dataset_size": stats[0] if stats else 0,
+                "dataset_size": total_rows,
+                "sampled_rows": sampled_rows,
                 "unique_categories": stats[1] if stats else 0,
-                "valid_ratings": stats[2] if stats else 0,
+                "valid_ratings": round(stats[2] * scale) if stats else 0,
                 "rating_range": {
                     "min": stats[3] if stats else None,
                     "max": stats[4] if stats else None
                 },
                 "data_quality": {
-                    "missing_categories": stats[5] if stats else 0,
+                    "missing_categories": round(stats[5] * scale) if stats else 0,
                     "unique_products": stats[6] if stats else 0,
-                    "rating_completeness": round((stats[2] / stats[0]) * 100, 2) if stats and stats[0] > 0 else 0
+                    "rating_completeness": round((stats[2] / sampled_rows) * 100, 2) if sampled_rows > 0 else 0
                 },
                 "recommendations": []
             }
@@ -187,21 +254,26 @@ class LargeScaleAnalyzer:
             if validation_result["dataset_size"] < 100000:
                 validation_result["recommendations"].append("Small dataset size - statistical significance may be limited")
             
-            logger.info(f"Dataset validation completed: {validation_result['dataset_size']:,} rows, "
-                       f"{validation_result['unique_categories']} categories")
+            logger.info("Dataset validation completed: %d rows, %s categories",
+                        validation_result['dataset_size'], validation_result['unique_categories'])
             
             return validation_result
             
         except Exception as e:
             logger.error(f"Dataset validation failed: {e}")
             return {"error": str(e), "validation_timestamp": datetime.now().isoformat()}
+        
+        finally:
+            if conn is not None:
+                conn.close()
     
-    def load_dataset_optimized(self, csv_path: str = None) -> bool:
+    def load_dataset_optimized(self, csv_path: str = None, force: bool = False) -> bool:
         """
         Load dataset with optimizations for large-scale analysis
         
         Args:
             csv_path: Path to dataset CSV file
+            force: Reload even if DuckDB already holds this file's current contents
             
         Returns:
             bool: Success status
@@ -213,7 +285,18 @@ class LargeScaleAnalyzer:
             logger.error("Dataset path not found. Run download_and_prepare_dataset() first.")
             return False
         
-        logger.info(f"Loading large dataset from {csv_path} with performance optimizations...")
+        # Validate and load from a Parquet copy, converted once and refreshed with the CSV
+        if csv_path.endswith('.csv'):
+            csv_path = convert_csv_to_parquet(csv_path) or csv_path
+        
+        # An unchanged file (same path and mtime) is not validated or loaded again, so
+        # run_comprehensive_analysis can warm-start from its persisted results
+        if not force and self.duckdb_handler.amazon_dataset_loaded(csv_path):
+            logger.info("Dataset %s already loaded into DuckDB, skipping load", csv_path)
+            self.dataset_path = csv_path
+            return True
+        
+        logger.info("Loading large dataset from %s with performance optimizations...", csv_path)
         start_time = time.time()
         
         try:
@@ -228,10 +311,12 @@ class LargeScaleAnalyzer:
             
             if success:
                 load_time = time.time() - start_time
-                logger.info(f"Dataset loaded successfully in {load_time:.2f} seconds")
+                logger.info("Dataset loaded successfully in %.2f seconds", load_time)
                 
-                # Cache dataset info
+                # Cache dataset info and the row count counted by the load
+                self._invalidate()
                 self.analysis_cache["dataset_info"] = validation
+                self.analysis_cache["row_count"] = self.duckdb_handler.amazon_row_count
                 self.dataset_path = csv_path
                 
             return success
@@ -253,39 +338,60 @@ class LargeScaleAnalyzer:
         logger.info("Starting comprehensive large-scale category analysis...")
         start_time = time.time()
         
+        # Warm start from results persisted for the same dataset file
+        persisted_path = self._analysis_cache_path() if cache_results else None
+        if persisted_path:
+            persisted = self._load_persisted_analysis(persisted_path)
+            if persisted is not None:
+                logger.info("Loaded comprehensive analysis from %s", persisted_path)
+                self.analysis_cache["latest_analysis"] = persisted
+                return persisted
+        
         try:
-            # Check if we have data loaded
-            conn = self.duckdb_handler.connect()
-            row_count = conn.execute("SELECT COUNT(*) FROM amazon_products").fetchone()[0]
+            # Check if we have data loaded (row count is known from the load when possible)
+            row_count = self.analysis_cache.get("row_count")
+            if row_count is None:
+                conn = self.duckdb_handler.cursor()
+                try:
+                    row_count = conn.execute("SELECT COUNT(*) FROM amazon_products").fetchone()[0]
+                finally:
+                    conn.close()
             
             if row_count == 0:
                 return {"error": "No data loaded. Run load_dataset_optimized() first."}
             
-            logger.info(f"Analyzing {row_count:,} products...")
+            logger.info("Analyzing %d products...", row_count)
             
-            # 1. Category Performance Analysis
-            logger.info("1/5: Running category performance analysis...")
-            category_analysis = self.duckdb_handler.get_category_analysis()
+            # Steps 2 and 3 scan amazon_products on their own cursors, overlapping
+            # with the category analysis query (DuckDB releases the GIL)
+            logger.info("1-3/5: Running category, statistical and rating distribution analysis...")
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                # 2. Statistical Insights
+                insights_future = pool.submit(self.duckdb_handler.get_statistical_insights)
+                
+                # 3. Rating Distribution Analysis
+                distribution_future = pool.submit(self.duckdb_handler.get_rating_distribution)
+                
+                # 1. Category Performance Analysis, as row dicts built by Arrow (when
+                # installed); the summaries below query DuckDB instead of this list
+                category_analysis = self.duckdb_handler.get_category_analysis_records()
+                
+                statistical_insights = insights_future.result()
+                rating_distribution = distribution_future.result()
             
-            if safe_dataframe_operation(category_analysis, 'empty'):
+            # Emptiness is checked once here and passed to the helpers below
+            category_empty = not category_analysis
+            if category_empty:
                 return {"error": "Category analysis returned no results"}
             
-            # 2. Statistical Insights
-            logger.info("2/5: Generating statistical insights...")
-            statistical_insights = self.duckdb_handler.get_statistical_insights()
-            
-            # 3. Rating Distribution Analysis
-            logger.info("3/5: Analyzing rating distributions...")
-            rating_distribution = self.duckdb_handler.get_rating_distribution()
-            
             # 4. Advanced Variability Analysis
             logger.info("4/5: Computing variability metrics...")
-            variability_insights = self._compute_advanced_variability(category_analysis)
+            variability_insights = self._compute_advanced_variability(category_empty)
             
             # 5. Performance Summary
             logger.info("5/5: Generating performance summary...")
             performance_summary = self._generate_performance_summary(
-                category_analysis, statistical_insights, row_count
+                statistical_insights, row_count, category_empty
             )
             
             # Compile final results
@@ -299,152 +405,96 @@ class LargeScaleAnalyzer:
                     "categories_analyzed": len(category_analysis),
                     "version": "2.0.0"
                 },
-                "category_analysis": safe_dataframe_operation(category_analysis, 'to_dict', 'records'),
+                "category_analysis": category_analysis,
                 "statistical_insights": statistical_insights,
-                "rating_distribution": safe_dataframe_operation(rating_distribution, 'to_dict', 'records') if not safe_dataframe_operation(rating_distribution, 'empty') else [],
+                "rating_distribution": rating_distribution.to_dict('records'),
                 "variability_insights": variability_insights,
                 "performance_summary": performance_summary,
-                "key_findings": self._extract_key_findings(category_analysis, statistical_insights),
+                "key_findings": self._extract_key_findings(category_empty, statistical_insights),
                 "scalability_metrics": {
                     "query_performance": f"{analysis_time:.2f}s for {row_count:,} rows",
                     "memory_efficiency": "Optimized for large datasets",
-                    "indexing_strategy": "Category and rating indexes created"
+                    "indexing_strategy": "Rows clustered by category and rating; category and rating indexes created"
                 }
             }
             
             # Cache results if requested
             if cache_results:
                 self.analysis_cache["latest_analysis"] = results
+                if persisted_path:
+                    self._persist_analysis(persisted_path, results)
             
-            logger.info(f"Comprehensive analysis completed in {analysis_time:.2f} seconds")
+            logger.info("Comprehensive analysis completed in %.2f seconds", analysis_time)
             return results
             
         except Exception as e:
             logger.error(f"Comprehensive analysis failed: {e}")
             return {"error": str(e), "timestamp": datetime.now().isoformat()}
     
-    def _compute_advanced_variability(self, category_df: Any) -> Dict[str, Any]:
+    def _compute_advanced_variability(self, category_empty: bool) -> Dict[str, Any]:
         """Compute advanced variability metrics for categories"""
         try:
-            if safe_dataframe_operation(category_df, 'empty'):
+            if category_empty:
                 return {"error": "No category data available"}
             
-            # For compatibility, work with the data structure we get
-            if PANDAS_AVAILABLE and hasattr(category_df, 'nlargest'):
-                # Use pandas methods
-                highest_variance = category_df.nlargest(5, 'rating_variance')[['category', 'rating_variance']].to_dict('records')
-                lowest_variance = category_df.nsmallest(5, 'rating_variance')[['category', 'rating_variance']].to_dict('records')
-                highest_stddev = category_df.nlargest(5, 'rating_stddev')[['category', 'rating_stddev']].to_dict('records')
-                most_consistent = category_df.nsmallest(5, 'rating_stddev')[['category', 'rating_stddev']].to_dict('records')
-                
-                # Calculate coefficient of variation where possible
-                category_df['coefficient_of_variation'] = category_df['rating_stddev'] / category_df['avg_rating']
-                highest_cv = category_df.nlargest(5, 'coefficient_of_variation')[['category', 'coefficient_of_variation']].to_dict('records')
-                
-                variability_summary = {
-                    "mean_variance": category_df['rating_variance'].mean(),
-                    "mean_stddev": category_df['rating_stddev'].mean(),
-                    "variance_range": {
-                        "min": category_df['rating_variance'].min(),
-                        "max": category_df['rating_variance'].max()
-                    }
-                }
-            else:
-                # Fallback for when pandas is not available
-                # Assume we get a list of dictionaries
-                data = category_df if isinstance(category_df, list) else safe_dataframe_operation(category_df, 'to_dict', 'records')
-                
-                # Sort and get top/bottom 5
-                sorted_by_variance = sorted(data, key=lambda x: x.get('rating_variance', 0), reverse=True)
-                highest_variance = [{"category": item.get("category"), "rating_variance": item.get("rating_variance")} 
-                                 for item in sorted_by_variance[:5]]
-                lowest_variance = [{"category": item.get("category"), "rating_variance": item.get("rating_variance")} 
-                                for item in sorted_by_variance[-5:]]
-                
-                sorted_by_stddev = sorted(data, key=lambda x: x.get('rating_stddev', 0), reverse=True)
-                highest_stddev = [{"category": item.get("category"), "rating_stddev": item.get("rating_stddev")} 
-                                for item in sorted_by_stddev[:5]]
-                most_consistent = [{"category": item.get("category"), "rating_stddev": item.get("rating_stddev")} 
-                                 for item in sorted_by_stddev[-5:]]
-                
-                # Calculate coefficient of variation manually
-                cv_data = []
-                for item in data:
-                    if item.get('avg_rating', 0) != 0:
-                        cv = item.get('rating_stddev', 0) / item.get('avg_rating', 1)
-                        cv_data.append({"category": item.get("category"), "coefficient_of_variation": cv})
-                
-                cv_data.sort(key=lambda x: x.get('coefficient_of_variation', 0), reverse=True)
-                highest_cv = cv_data[:5]
-                
-                # Calculate summary statistics
-                variances = [item.get('rating_variance', 0) for item in data]
-                stddevs = [item.get('rating_stddev', 0) for item in data]
-                
-                variability_summary = {
-                    "mean_variance": sum(variances) / len(variances) if variances else 0,
-                    "mean_stddev": sum(stddevs) / len(stddevs) if stddevs else 0,
+            # Top/bottom-5 per metric come back from one DuckDB query, tagged by kind
+            rows, summary = self.duckdb_handler.get_variability_topk(5)
+            if not summary:
+                return {"error": "Variability query failed"}
+            
+            metric_names = {
+                "highest_variance": "rating_variance",
+                "lowest_variance": "rating_variance",
+                "highest_stddev": "rating_stddev",
+                "most_consistent": "rating_stddev",
+                "highest_cv": "coefficient_of_variation"
+            }
+            buckets = {kind: [] for kind in metric_names}
+            for kind, category, value in rows:
+                buckets[kind].append({"category": category, metric_names[kind]: value})
+            
+            return {
+                "highest_variance_categories": buckets["highest_variance"],
+                "lowest_variance_categories": buckets["lowest_variance"],
+                "highest_stddev_categories": buckets["highest_stddev"],
+                "most_consistent_categories": buckets["most_consistent"],
+                "highest_coefficient_variation": buckets["highest_cv"],
+                "variability_summary": {
+                    "mean_variance": summary["mean_variance"],
+                    "mean_stddev": summary["mean_stddev"],
                     "variance_range": {
-                        "min": min(variances) if variances else 0,
-                        "max": max(variances) if variances else 0
+                        "min": summary["min_variance"],
+                        "max": summary["max_variance"]
                     }
                 }
-            
-            return {
-                "highest_variance_categories": highest_variance,
-                "lowest_variance_categories": lowest_variance,
-                "highest_stddev_categories": highest_stddev,
-                "most_consistent_categories": most_consistent,
-                "highest_coefficient_variation": highest_cv,
-                "variability_summary": variability_summary
             }
             
         except Exception as e:
             logger.error(f"Error computing variability metrics: {e}")
             return {"error": str(e)}
     
-    def _generate_performance_summary(self, category_df: Any, 
-                                    insights: Dict[str, Any], row_count: int) -> Dict[str, Any]:
+    def _generate_performance_summary(self, insights: Dict[str, Any], row_count: int,
+                                      category_empty: bool) -> Dict[str, Any]:
         """Generate performance and scalability summary"""
         try:
             # Performance categories
-            if not safe_dataframe_operation(category_df, 'empty'):
-                # Handle both pandas DataFrame and list of dicts
-                if PANDAS_AVAILABLE and hasattr(category_df, 'head'):
-                    top_performers = category_df.head(3)[['category', 'avg_rating', 'product_count']].to_dict('records')
-                    bottom_performers = category_df.tail(3)[['category', 'avg_rating', 'product_count']].to_dict('records')
-                    significant_categories = category_df[category_df['significance_level'] == 'Significant']
-                    
-                    dataset_scale = {
-                        "total_products": row_count,
-                        "categories_analyzed": len(category_df),
-                        "average_products_per_category": round(category_df['product_count'].mean(), 1),
-                        "largest_category_size": category_df['product_count'].max(),
-                        "smallest_category_size": category_df['product_count'].min()
-                    }
-                else:
-                    # Fallback for list of dicts
-                    data = category_df if isinstance(category_df, list) else []
-                    top_performers = [{"category": item.get("category"), "avg_rating": item.get("avg_rating"), 
-                                     "product_count": item.get("product_count")} for item in data[:3]]
-                    bottom_performers = [{"category": item.get("category"), "avg_rating": item.get("avg_rating"), 
-                                        "product_count": item.get("product_count")} for item in data[-3:]]
-                    
-                    significant_categories = [item for item in data if item.get('significance_level') == 'Significant']
-                    
-                    product_counts = [item.get('product_count', 0) for item in data]
-                    dataset_scale = {
-                        "total_products": row_count,
-                        "categories_analyzed": len(data),
-                        "average_products_per_category": round(sum(product_counts) / len(product_counts), 1) if product_counts else 0,
-                        "largest_category_size": max(product_counts) if product_counts else 0,
-                        "smallest_category_size": min(product_counts) if product_counts else 0
-                    }
+            if not category_empty:
+                # Top/bottom categories and size stats are aggregated in DuckDB
+                top_performers, bottom_performers = self.duckdb_handler.get_category_extremes(3)
+                stats = self.duckdb_handler.get_findings_scalars()
+                
+                dataset_scale = {
+                    "total_products": row_count,
+                    "categories_analyzed": stats.get("category_count", 0),
+                    "average_products_per_category": stats.get("average_products_per_category", 0),
+                    "largest_category_size": stats.get("largest_category_size", 0),
+                    "smallest_category_size": stats.get("smallest_category_size", 0)
+                }
                 
                 return {
                     "top_performing_categories": top_performers,
                     "underperforming_categories": bottom_performers,
-                    "statistically_significant_categories": len(significant_categories),
+                    "statistically_significant_categories": stats.get("significant_count", 0),
                     "dataset_scale": dataset_scale,
                     "quality_metrics": {
                         "overall_rating_average": insights.get('overall_average_rating', 0),
@@ -459,59 +509,28 @@ class LargeScaleAnalyzer:
             logger.error(f"Error generating performance summary: {e}")
             return {"error": str(e)}
     
-    def _extract_key_findings(self, category_df: Any, insights: Dict[str, Any]) -> List[str]:
+    def _extract_key_findings(self, category_empty: bool, insights: Dict[str, Any]) -> List[str]:
         """Extract key actionable findings from the analysis"""
         findings = []
         
         try:
-            if not safe_dataframe_operation(category_df, 'empty'):
-                # Handle both pandas DataFrame and list formats
-                if PANDAS_AVAILABLE and hasattr(category_df, 'iloc'):
-                    # Use pandas methods
-                    best_category = category_df.iloc[0]
-                    worst_category = category_df.iloc[-1]
-                    highest_var = category_df.loc[category_df['rating_variance'].idxmax()]
-                    most_consistent = category_df.loc[category_df['rating_variance'].idxmin()]
-                    significant_cats = category_df[category_df['significance_level'] == 'Significant']
+            if not category_empty:
+                # Best/worst and variance extremes come from one SQL aggregate
+                stats = self.duckdb_handler.get_findings_scalars()
+                if stats.get("category_count"):
+                    findings.append(f"'{stats['best_category']}' is the top-performing category with {stats['best_avg_rating']:.2f} average rating from {stats['best_product_count']:,} products")
                     
                     # Only add "lowest performance" if we have multiple categories and they're different
-                    findings.append(f"'{best_category['category']}' is the top-performing category with {best_category['avg_rating']:.2f} average rating from {best_category['product_count']:,} products")
-                    
-                    if len(category_df) > 1 and worst_category['category'] != best_category['category']:
-                        findings.append(f"'{worst_category['category']}' shows the lowest performance with {worst_category['avg_rating']:.2f} average rating")
+                    if stats["category_count"] > 1 and stats["worst_category"] != stats["best_category"]:
+                        findings.append(f"'{stats['worst_category']}' shows the lowest performance with {stats['worst_avg_rating']:.2f} average rating")
                     
-                    # Only add variability insights if we have meaningful variance differences
-                    if len(category_df) > 1:
-                        findings.append(f"'{highest_var['category']}' shows highest rating variability (σ²={highest_var['rating_variance']:.3f}), indicating inconsistent product quality")
-                        findings.append(f"'{most_consistent['category']}' demonstrates most consistent quality (σ²={most_consistent['rating_variance']:.3f})")
+                    # Only add variability insights if we have multiple categories
+                    if stats["category_count"] > 1:
+                        findings.append(f"'{stats['highest_variance_category']}' shows highest rating variability (σ²={stats['highest_variance']:.3f}), indicating inconsistent product quality")
+                        findings.append(f"'{stats['lowest_variance_category']}' demonstrates most consistent quality (σ²={stats['lowest_variance']:.3f})")
                     
-                    if not significant_cats.empty:
-                        findings.append(f"{len(significant_cats)} categories show statistically significant performance differences from the dataset mean")
-                else:
-                    # Fallback for list of dicts
-                    data = category_df if isinstance(category_df, list) else []
-                    if data:
-                        best_category = data[0]
-                        worst_category = data[-1]
-                        
-                        findings.append(f"'{best_category.get('category', 'Unknown')}' is the top-performing category with {best_category.get('avg_rating', 0):.2f} average rating from {best_category.get('product_count', 0):,} products")
-                        
-                        # Only add "lowest performance" if we have multiple categories and they're different
-                        if len(data) > 1 and worst_category.get('category') != best_category.get('category'):
-                            findings.append(f"'{worst_category.get('category', 'Unknown')}' shows the lowest performance with {worst_category.get('avg_rating', 0):.2f} average rating")
-                        
-                        # Only add variability insights if we have multiple categories
-                        if len(data) > 1:
-                            # Find highest variance
-                            highest_var = max(data, key=lambda x: x.get('rating_variance', 0))
-                            most_consistent = min(data, key=lambda x: x.get('rating_variance', float('inf')))
-                            
-                            findings.append(f"'{highest_var.get('category', 'Unknown')}' shows highest rating variability (σ²={highest_var.get('rating_variance', 0):.3f}), indicating inconsistent product quality")
-                            findings.append(f"'{most_consistent.get('category', 'Unknown')}' demonstrates most consistent quality (σ²={most_consistent.get('rating_variance', 0):.3f})")
-                        
-                        significant_cats = [item for item in data if item.get('significance_level') == 'Significant']
-                        if significant_cats:
-                            findings.append(f"{len(significant_cats)} categories show statistically significant performance differences from the dataset mean")
+                    if stats["significant_count"]:
+                        findings.append(f"{stats['significant_count']} categories show statistically significant performance differences from the dataset mean")
                 
                 # Quality distribution insight - fix the calculation
                 high_quality_pct = insights.get('quality_distribution', {}).get('high_rated_percentage', 0)
@@ -531,13 +550,16 @@ class LargeScaleAnalyzer:
             logger.error(f"Error extracting key findings: {e}")
             return [f"Error generating insights: {str(e)}"]
     
-    def export_results(self, results: Dict[str, Any], output_dir: str = "data/large_scale_analysis") -> Dict[str, str]:
+    def export_results(self, results: Dict[str, Any], output_dir: str = "data/large_scale_analysis",
+                       file_format: str = "csv") -> Dict[str, str]:
         """
         Export analysis results to multiple formats for dashboard integration
         
         Args:
             results: Analysis results dictionary
             output_dir: Directory to save results
+            file_format: Category table format, "csv", "parquet" (typed, compressed columns)
+                or "json" (array of row objects)
             
         Returns:
             Dict of exported file paths
@@ -550,15 +572,16 @@ class LargeScaleAnalyzer:
             
             # 1. JSON for API integration
             json_path = f"{output_dir}/analysis_results_{timestamp}.json"
-            with open(json_path, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+            _write_json(json_path, results)
             exported_files["json"] = json_path
             
-            # 2. CSV exports for dashboard tools
-            if "category_analysis" in results and PANDAS_AVAILABLE:
-                csv_path = f"{output_dir}/category_analysis_{timestamp}.csv"
-                pd.DataFrame(results["category_analysis"]).to_csv(csv_path, index=False)
-                exported_files["category_csv"] = csv_path
+            # 2. Category table for dashboard tools (CSV, JSON) or analytics reloads (Parquet)
+            if "category_analysis" in results:
+                ext = file_format if file_format in ("parquet", "json") else "csv"
+                table_path = f"{output_dir}/category_analysis_{timestamp}.{ext}"
+                # Written by DuckDB from the materialized stats, no DataFrame round-trip
+                if self.duckdb_handler.export_category_stats(table_path, ext):
+                    exported_files[f"category_{ext}"] = table_path
             
             # 3. Executive summary
             summary_path = f"{output_dir}/executive_summary_{timestamp}.txt"
@@ -573,11 +596,10 @@ class LargeScaleAnalyzer:
                 "analysis_duration": results.get("analysis_metadata", {}).get("analysis_duration_seconds"),
                 "categories_count": results.get("analysis_metadata", {}).get("categories_analyzed")
             }
-            with open(metrics_path, 'w') as f:
-                json.dump(metrics, f, indent=2)
+            _write_json(metrics_path, metrics)
             exported_files["metrics"] = metrics_path
             
-            logger.info(f"Results exported to {len(exported_files)} files in {output_dir}")
+            logger.info("Results exported to %d files in %s", len(exported_files), output_dir)
             return exported_files
             
         except Exception as e:
@@ -587,48 +609,50 @@ class LargeScaleAnalyzer:
     def _generate_executive_summary(self, results: Dict[str, Any], output_path: str):
         """Generate executive summary report"""
         try:
-            with open(output_path, 'w') as f:
-                f.write("AMAZON UK PRODUCTS - LARGE-SCALE ANALYSIS EXECUTIVE SUMMARY\n")
-                f.write("=" * 70 + "\n\n")
-                
-                # Metadata
-                metadata = results.get("analysis_metadata", {})
-                f.write(f"Analysis Date: {metadata.get('timestamp', 'Unknown')}\n")
-                f.write(f"Dataset Size: {metadata.get('dataset_size', 0):,} products\n")
-                f.write(f"Analysis Duration: {metadata.get('analysis_duration_seconds', 0)} seconds\n")
-                f.write(f"Categories Analyzed: {metadata.get('categories_analyzed', 0)}\n\n")
-                
-                # Key Findings
-                f.write("KEY FINDINGS\n")
-                f.write("-" * 20 + "\n")
-                key_findings = results.get("key_findings", [])
-                for i, finding in enumerate(key_findings, 1):
-                    f.write(f"{i}. {finding}\n")
-                f.write("\n")
-                
-                # Performance Summary
-                perf_summary = results.get("performance_summary", {})
-                if "top_performing_categories" in perf_summary:
-                    f.write("TOP PERFORMING CATEGORIES\n")
-                    f.write("-" * 25 + "\n")
-                    for cat in perf_summary["top_performing_categories"]:
-                        f.write(f"• {cat['category']}: {cat['avg_rating']:.2f} avg rating ({cat['product_count']:,} products)\n")
-                    f.write("\n")
-                
-                # Scalability Metrics
-                scalability = results.get("scalability_metrics", {})
-                f.write("SCALABILITY PERFORMANCE\n")
-                f.write("-" * 22 + "\n")
-                f.write(f"Query Performance: {scalability.get('query_performance', 'N/A')}\n")
-                f.write(f"Memory Efficiency: {scalability.get('memory_efficiency', 'N/A')}\n")
-                f.write(f"Indexing Strategy: {scalability.get('indexing_strategy', 'N/A')}\n")
-                
+            # Build the whole report in memory and write it once
+            lines = []
+            lines.append("AMAZON UK PRODUCTS - LARGE-SCALE ANALYSIS EXECUTIVE SUMMARY\n")
+            lines.append("=" * 70 + "\n\n")
+            
+            # Metadata
+            metadata = results.get("analysis_metadata", {})
+            lines.append(f"Analysis Date: {metadata.get('timestamp', 'Unknown')}\n")
+            lines.append(f"Dataset Size: {metadata.get('dataset_size', 0):,} products\n")
+            lines.append(f"Analysis Duration: {metadata.get('analysis_duration_seconds', 0)} seconds\n")
+            lines.append(f"Categories Analyzed: {metadata.get('categories_analyzed', 0)}\n\n")
+            
+            # Key Findings
+            lines.append("KEY FINDINGS\n")
+            lines.append("-" * 20 + "\n")
+            key_findings = results.get("key_findings", [])
+            lines.extend(f"{i}. {finding}\n" for i, finding in enumerate(key_findings, 1))
+            lines.append("\n")
+            
+            # Performance Summary
+            perf_summary = results.get("performance_summary", {})
+            if "top_performing_categories" in perf_summary:
+                lines.append("TOP PERFORMING CATEGORIES\n")
+                lines.append("-" * 25 + "\n")
+                lines.extend(map(_TOP_CATEGORY_LINE, perf_summary["top_performing_categories"]))
+                lines.append("\n")
+            
+            # Scalability Metrics
+            scalability = results.get("scalability_metrics", {})
+            lines.append("SCALABILITY PERFORMANCE\n")
+            lines.append("-" * 22 + "\n")
+            lines.append(f"Query Performance: {scalability.get('query_performance', 'N/A')}\n")
+            lines.append(f"Memory Efficiency: {scalability.get('memory_efficiency', 'N/A')}\n")
+            lines.append(f"Indexing Strategy: {scalability.get('indexing_strategy', 'N/A')}\n")
+            
+            with _atomic_open(output_path) as f:
+                f.write("".join(lines))
+            
         except Exception as e:
             logger.error(f"Error generating executive summary: {e}")
     
     def cleanup(self):
         """Clean up resources"""
-        if self.duckdb_handler:
+        if self.duckdb_handler and self._owns_handler:
             self.duckdb_handler.close()
 
 # Convenience functions for API integration
@@ -675,14 +699,14 @@ def get_analysis_summary(results: Dict[str, Any]) -> Dict[str, Any]:
     if "error" in results:
         return results
     
-    metadata = results.get("analysis_metadata", {})
-    perf_summary = results.get("performance_summary", {})
+    metadata = results.get("analysis_metadata") or {}
+    top_categories = (results.get("performance_summary") or {}).get("top_performing_categories")
     
     return {
         "dataset_scale": metadata.get("dataset_size", 0),
         "categories_count": metadata.get("categories_analyzed", 0),
         "analysis_duration": metadata.get("analysis_duration_seconds", 0),
-        "top_category": perf_summary.get("top_performing_categories", [{}])[0] if perf_summary.get("top_performing_categories") else {},
-        "key_insights_count": len(results.get("key_findings", [])),
+        "top_category": top_categories[0] if top_categories else {},
+        "key_insights_count": len(results.get("key_findings") or ()),
         "timestamp": metadata.get("timestamp")
     }
@@ -3,22 +3,33 @@ Main application entry point for the Newegg web scraper
 """
 import asyncio
 import argparse
+import functools
 import logging
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 from datetime import datetime
 import json
 import os
 import sys
 
+# uvloop's libuv event loop dispatches socket readiness faster; fall back to asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
 
-from scraper import NeweggScraper, ScrapingResult
 from storage import SQLiteHandler
-from scraper.config import TARGET_URL, LOG_LEVEL, LOG_FILE, DATABASE_PATH
+from scraper.config import TARGET_URL, LOG_LEVEL, LOG_FILE, DATABASE_PATH, MAX_CONCURRENT_REQUESTS
 from scraper.utils import setup_logging
 
+# The scraper stack (aiohttp, Selenium, cloudscraper) is imported on first scrape
+if TYPE_CHECKING:
+    from scraper import NeweggScraper
+
 logger = logging.getLogger(__name__)
 
 class ScrapingOrchestrator:
@@ -27,7 +38,41 @@ class ScrapingOrchestrator:
     def __init__(self, database_path: str = DATABASE_PATH):
         self.database_path = database_path
         self.db_handler = SQLiteHandler(database_path)
-        self.scraper = None
+        self.scraper = None  # Opened on first scrape, reused until aclose()
+        self._scraper_lock = asyncio.Lock()
+        # One writer thread keeps SQLite commits off the event loop, in submission order
+        self._db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+    
+    async def _run_db(self, func, *args, **kwargs):
+        """Run a blocking database write on the writer thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_writer, functools.partial(func, *args, **kwargs))
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def _get_scraper(self) -> "NeweggScraper":
+        """
+        The orchestrator's long-lived scraper, initialized on first use so its HTTP
+        connection pool, DNS cache and cookies carry over between scrapes
+        """
+        async with self._scraper_lock:
+            if self.scraper is None:
+                from scraper import NeweggScraper
+                scraper = NeweggScraper()
+                await scraper.__aenter__()
+                self.scraper = scraper
+        return self.scraper
+    
+    async def aclose(self):
+        """Close the shared scraper and wait for queued database writes"""
+        if self.scraper is not None:
+            scraper, self.scraper = self.scraper, None
+            await scraper.__aexit__(None, None, None)
+        self.close()
         
     async def scrape_product(
         self, 
@@ -47,87 +92,148 @@ class ScrapingOrchestrator:
             Dictionary containing scraping results and metadata
         """
         start_time = time.time()
-        session_data = {
-            "url": url,
-            "method_used": method,
-            "success": False,
-            "total_reviews_extracted": 0,
-            "duration_seconds": 0
-        }
+        session_data = self._new_session_data(url, method)
         
         try:
-            logger.info(f"Starting scraping process for: {url}")
-            logger.info(f"Target reviews: {max_reviews}, Method: {method}")
+            logger.info("Starting scraping process for: %s", url)
+            logger.info("Target reviews: %d, Method: %s", max_reviews, method)
             
-            # Initialize scraper
-            async with NeweggScraper() as scraper:
-                self.scraper = scraper
-                
-                # Perform scraping
-                scraped_data = await scraper.scrape_product_and_reviews(url, max_reviews)
-                
-                if "error" in scraped_data:
-                    session_data["error_message"] = scraped_data["error"]
-                    logger.error(f"Scraping failed: {scraped_data['error']}")
-                    return {
-                        "success": False,
-                        "error": scraped_data["error"],
-                        "session_data": session_data
-                    }
-                
-                # Save to database
-                product_data = scraped_data.get("product", {})
-                reviews_data = scraped_data.get("reviews", [])
-                
-                if product_data:
-                    product_id = self.db_handler.save_product(product_data)
-                    logger.info(f"Saved product with ID: {product_id}")
-                    
-                    if reviews_data:
-                        new_reviews_count = self.db_handler.save_reviews(reviews_data, product_id)
-                        session_data["total_reviews_extracted"] = new_reviews_count
-                        logger.info(f"Saved {new_reviews_count} new reviews")
-                
-                # Update session data
-                session_data["success"] = True
-                session_data["method_used"] = scraped_data.get("extraction_method", method)
-                
-                # Calculate duration
-                duration = time.time() - start_time
-                session_data["duration_seconds"] = round(duration, 2)
-                
-                # Save session
-                session_id = self.db_handler.save_scraping_session(session_data)
-                
-                logger.info(f"Scraping completed successfully in {duration:.2f}s")
+            scraper = await self._get_scraper()
+            return await self._scrape_with(scraper, url, max_reviews, method)
                 
+        except Exception as e:
+            return await self._record_failure(session_data, start_time, e)
+    
+    async def scrape_products(
+        self,
+        urls: List[str],
+        max_reviews: int = 100,
+        method: str = "fallback",
+        concurrency: int = MAX_CONCURRENT_REQUESTS
+    ) -> List[Dict[str, Any]]:
+        """
+        Scrape several Newegg product pages concurrently through one shared scraper
+        
+        Args:
+            urls: Product URLs to scrape
+            max_reviews: Maximum number of reviews to extract per product
+            method: Scraping method recorded for each session
+            concurrency: Number of products fetched at the same time
+        
+        Returns:
+            One scrape_product-style result per URL, in input order
+        """
+        logger.info("Starting concurrent scraping of %d products (concurrency %d)", len(urls), concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        scraper = await self._get_scraper()
+        
+        async def scrape_one(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._scrape_with(scraper, url, max_reviews, method)
+        
+        # Network waits overlap; total time tracks the slowest pages, not the sum
+        return await asyncio.gather(*(scrape_one(url) for url in urls))
+    
+    async def _scrape_with(
+        self,
+        scraper: "NeweggScraper",
+        url: str,
+        max_reviews: int,
+        method: str
+    ) -> Dict[str, Any]:
+        """Scrape one product with an already-initialized scraper and save it"""
+        start_time = time.time()
+        session_data = self._new_session_data(url, method)
+        
+        try:
+            # Perform scraping
+            scraped_data = await scraper.scrape_product_and_reviews(url, max_reviews)
+            
+            if "error" in scraped_data:
+                session_data["error_message"] = scraped_data["error"]
+                logger.error(f"Scraping failed: {scraped_data['error']}")
                 return {
-                    "success": True,
-                    "product": product_data,
-                    "reviews": reviews_data,
-                    "statistics": {
-                        "total_reviews_found": len(reviews_data),
-                        "extraction_method": scraped_data.get("extraction_method"),
-                        "duration_seconds": duration,
-                        "session_id": session_id
-                    },
+                    "success": False,
+                    "error": scraped_data["error"],
                     "session_data": session_data
                 }
+            
+            # Save to database
+            product_data = scraped_data.get("product", {})
+            reviews_data = scraped_data.get("reviews", [])
+            
+            if product_data:
+                product_id, new_reviews_count = await self._run_db(
+                    self.db_handler.save_product_with_reviews,
+                    product_data, reviews_data
+                )
+                logger.info("Saved product with ID: %s", product_id)
                 
-        except Exception as e:
+                if reviews_data:
+                    session_data["total_reviews_extracted"] = new_reviews_count
+                    logger.info("Saved %d new reviews", new_reviews_count)
+            
+            # Update session data
+            session_data["success"] = True
+            session_data["method_used"] = scraped_data.get("extraction_method", method)
+            
+            # Calculate duration
             duration = time.time() - start_time
             session_data["duration_seconds"] = round(duration, 2)
-            session_data["error_message"] = str(e)
             
-            # Save failed session
-            self.db_handler.save_scraping_session(session_data)
+            # Save session
+            session_id = await self._run_db(self.db_handler.save_scraping_session, session_data)
+            
+            logger.info("Scraping completed successfully in %.2fs", duration)
             
-            logger.error(f"Scraping process failed: {e}")
             return {
-                "success": False,
-                "error": str(e),
+                "success": True,
+                "product": product_data,
+                "reviews": reviews_data,
+                "statistics": {
+                    "total_reviews_found": len(reviews_data),
+                    "extraction_method": scraped_data.get("extraction_method"),
+                    "duration_seconds": duration,
+                    "session_id": session_id
+                },
                 "session_data": session_data
             }
+            
+        except Exception as e:
+            return await self._record_failure(session_data, start_time, e)
+    
+    @staticmethod
+    def _new_session_data(url: str, method: str) -> Dict[str, Any]:
+        """Initial scraping session record for one URL"""
+        return {
+            "url": url,
+            "method_used": method,
+            "success": False,
+            "total_reviews_extracted": 0,
+            "duration_seconds": 0
+        }
+    
+    async def _record_failure(self, session_data: Dict[str, Any], start_time: float, 
+                              error: Exception) -> Dict[str, Any]:
+        """Save a failed scraping session and build the failure result"""
+        duration = time.time() - start_time
+        session_data["duration_seconds"] = round(duration, 2)
+        session_data["error_message"] = str(error)
+        
+        # Save failed session
+        await self._run_db(self.db_handler.save_scraping_session, session_data)
+        
+        logger.error(f"Scraping process failed: {error}")
+        return {
+            "success": False,
+            "error": str(error),
+            "session_data": session_data
+        }
+    
+    def close(self):
+        """Wait for queued database writes and stop the writer thread"""
+        self._db_writer.shutdown(wait=True)
     
     def get_scraping_summary(self) -> Dict[str, Any]:
         """Get summary of all scraping activities"""
@@ -153,10 +259,11 @@ class ScrapingOrchestrator:
             logger.error(f"Export failed: {e}")
             return False
 
-async def main():
-    """Main function"""
+def _build_parser() -> argparse.ArgumentParser:
+    """Command-line options for the scraper"""
     parser = argparse.ArgumentParser(description="Newegg Product Scraper")
     parser.add_argument("--url", default=TARGET_URL, help="Product URL to scrape")
+    parser.add_argument("--urls-file", help="File of product URLs (one per line) to scrape concurrently")
     parser.add_argument("--max-reviews", type=int, default=100, help="Maximum reviews to extract")
     parser.add_argument("--method", choices=["selenium", "cloudscraper", "aiohttp", "fallback"], 
                        default="fallback", help="Scraping method")
@@ -166,7 +273,14 @@ async def main():
     parser.add_argument("--summary", action="store_true", help="Show summary of previous scraping sessions")
     parser.add_argument("--analysis", action="store_true", help="Run bonus category analysis")
     
-    args = parser.parse_args()
+    return parser
+
+# Built once at import; main() only parses
+PARSER = _build_parser()
+
+async def main():
+    """Main function"""
+    args = PARSER.parse_args()
     
     # Setup logging
     setup_logging(args.log_level, LOG_FILE)
@@ -220,7 +334,40 @@ async def main():
         
         # Perform scraping if URL provided
         if not args.summary and not args.analysis:
-            logger.info(f"Starting scraping process...")
+            logger.info("Starting scraping process...")
+            
+            # Scrape every URL in the file through one shared scraper
+            if args.urls_file:
+                with open(args.urls_file) as f:
+                    urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+                invalid = [url for url in urls if not url.startswith("http")]
+                if not urls or invalid:
+                    logger.error(f"Invalid URLs provided: {invalid or 'file is empty'}")
+                    return
+                
+                results = await orchestrator.scrape_products(
+                    urls,
+                    max_reviews=args.max_reviews,
+                    method=args.method
+                )
+                
+                succeeded = 0
+                for url, result in zip(urls, results):
+                    if result["success"]:
+                        succeeded += 1
+                        print(f"✅ {result['product'].get('title', url)}: "
+                              f"{result['statistics']['total_reviews_found']} reviews")
+                    else:
+                        print(f"❌ {url}: {result['error']}")
+                print(f"\nScraped {succeeded}/{len(urls)} products")
+                
+                if args.export and succeeded:
+                    export_file = f"data/export_{int(time.time())}.json"
+                    if orchestrator.export_data(export_file):
+                        print(f"Data exported to: {export_file}")
+                    else:
+                        print("Export failed")
+                return
             
             # Validate URL
             if not args.url or not args.url.startswith("http"):
@@ -264,7 +411,15 @@ async def main():
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
     finally:
+        await orchestrator.aclose()
         logger.info("Scraping session completed")
 
+def run():
+    """Run main() on uvloop when it is installed, otherwise the default asyncio loop"""
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -1,9 +1,9 @@
 """
 Scraper package initialization
+Classes are imported on first access so `import scraper.config` does not pull in
+aiohttp, Selenium and cloudscraper
 """
-from .newegg_scraper import NeweggScraper
-from .base_scraper import BaseScraper, ScrapingResult
-from .utils import ScrapingUtils, RetryHelper, RateLimiter
+import importlib
 
 __all__ = [
     'NeweggScraper',
@@ -13,3 +13,24 @@ __all__ = [
     'RetryHelper',
     'RateLimiter'
 ]
+
+# Submodule that defines each exported name
+_EXPORTS = {
+    'NeweggScraper': '.newegg_scraper',
+    'BaseScraper': '.base_scraper',
+    'ScrapingResult': '.base_scraper',
+    'ScrapingUtils': '.utils',
+    'RetryHelper': '.utils',
+    'RateLimiter': '.utils',
+}
+
+
+def __getattr__(name):
+    """Import the scraper classes lazily (PEP 562)"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -2,7 +2,10 @@
 Base scraper class with common functionality
 """
 import asyncio
+import atexit
+import functools
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any, Union
@@ -24,12 +27,92 @@ from bs4 import BeautifulSoup
 from .config import (
     CHROME_OPTIONS, DEFAULT_HEADERS, SELENIUM_TIMEOUT, 
     SELENIUM_IMPLICIT_WAIT, SELENIUM_EXPLICIT_WAIT,
-    MAX_RETRIES, RETRY_DELAY, REQUEST_DELAY_MIN, REQUEST_DELAY_MAX
+    MAX_RETRIES, RETRY_DELAY, REQUEST_DELAY_MIN, REQUEST_DELAY_MAX,
+    HTTP_TIMEOUT, HTTP_CONNECT_TIMEOUT, HTTP_SOCK_READ_TIMEOUT, HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_CACHE_TTL, HTTP_MIN_PAGE_BYTES, HTML_PARSER
 )
 from .utils import ScrapingUtils, RetryHelper, RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Chrome drivers handed back by cleanup() for the next scraper in this process;
+# Chrome is only quit at interpreter exit
+_DRIVER_POOL: List[webdriver.Chrome] = []
+_DRIVER_POOL_LOCK = threading.Lock()
+_CHROMEDRIVER_PATH: Optional[str] = None
+
+def _chromedriver_path() -> str:
+    """Resolve the chromedriver binary once instead of per browser launch"""
+    global _CHROMEDRIVER_PATH
+    with _DRIVER_POOL_LOCK:
+        if _CHROMEDRIVER_PATH is None:
+            _CHROMEDRIVER_PATH = ChromeDriverManager().install()
+        return _CHROMEDRIVER_PATH
+
+def _acquire_pooled_driver() -> Optional[webdriver.Chrome]:
+    """Pop a still-responsive driver from the pool, discarding dead ones"""
+    while True:
+        with _DRIVER_POOL_LOCK:
+            if not _DRIVER_POOL:
+                return None
+            driver = _DRIVER_POOL.pop()
+        try:
+            driver.current_url  # Raises if the browser has gone away
+            return driver
+        except WebDriverException:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+def _release_driver(driver: webdriver.Chrome):
+    """Return a driver to the pool for reuse"""
+    with _DRIVER_POOL_LOCK:
+        _DRIVER_POOL.append(driver)
+
+@atexit.register
+def _quit_pooled_drivers():
+    """Quit every pooled Chrome instance on interpreter exit"""
+    with _DRIVER_POOL_LOCK:
+        drivers = list(_DRIVER_POOL)
+        _DRIVER_POOL.clear()
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing driver: {e}")
+
+# Lowercase markers of a Cloudflare challenge page. Phrases that contain another
+# marker ("ddos protection by cloudflare", "checking your browser before accessing")
+# are left out since the shorter marker already matches them
+CLOUDFLARE_INDICATORS = (
+    "please enable cookies and reload the page",
+    "cf-browser-verification",
+    "challenge-platform",
+    "just a moment",
+    "cloudflare",
+    "unusual traffic",
+    "verify you are human",
+    "checking your browser",
+    "ray id"
+)
+
+# Lowercase markers that the real product page has rendered
+PAGE_LOADED_INDICATORS = (
+    "customer reviews", "add to cart", "price", "rating",
+    "product", "newegg", "specifications"
+)
+
+# Evaluated in the browser so polling returns two booleans instead of shipping the
+# whole DOM over the DevTools protocol; returns [challenge_active, page_loaded]
+CLOUDFLARE_PROBE_JS = """
+const html = document.documentElement.outerHTML.toLowerCase();
+const active = arguments[0].some(m => html.includes(m)) ||
+    document.title.toLowerCase().includes('just a moment') ||
+    window.location.href.toLowerCase().includes('cloudflare');
+return [active, arguments[1].some(m => html.includes(m))];
+"""
+
 @dataclass
 class ScrapingResult:
     """Data class for scraping results"""
@@ -46,12 +129,14 @@ class ScrapingResult:
 class BaseScraper(ABC):
     """Base class for web scrapers with multiple strategies"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.utils = ScrapingUtils()
         self.retry_helper = RetryHelper()
         self.rate_limiter = RateLimiter(max_calls=30, time_window=60.0)  # 30 calls per minute
-        self.session = None
+        self.session = session
+        self._owns_session = session is None
         self.driver = None
+        self._driver_lock = asyncio.Lock()
         self.cloudscraper = None
         
     async def __aenter__(self):
@@ -63,17 +148,37 @@ class BaseScraper(ABC):
         """Async context manager exit"""
         await self.cleanup()
     
+    @staticmethod
+    def create_session() -> aiohttp.ClientSession:
+        """Create an aiohttp session backed by a pooled keep-alive connector
+
+        Create this once per scraper (or share it); a session per request throws
+        away the pooled connections and DNS cache.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=HTTP_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_SOCK_READ_TIMEOUT
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers=DEFAULT_HEADERS
+        )
+    
     async def initialize(self):
         """Initialize scraping tools"""
         try:
-            # Initialize aiohttp session
-            connector = aiohttp.TCPConnector(limit=10, limit_per_host=3)
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout,
-                headers=DEFAULT_HEADERS
-            )
+            # Initialize aiohttp session unless one was injected
+            if self.session is None:
+                self.session = self.create_session()
+                self._owns_session = True
             
             # Initialize cloudscraper
             self.cloudscraper = cloudscraper.create_scraper(
@@ -83,6 +188,10 @@ class BaseScraper(ABC):
                     'mobile': False
                 }
             )
+            # Size the keep-alive pools of cloudscraper's own (TLS cipher) adapters
+            # to match the aiohttp pool instead of requests' default of 10
+            for adapter in self.cloudscraper.adapters.values():
+                adapter.init_poolmanager(HTTP_POOL_LIMIT_PER_HOST, HTTP_POOL_LIMIT_PER_HOST)
             
             logger.info("Scraper initialized successfully")
             
@@ -92,45 +201,33 @@ class BaseScraper(ABC):
     
     async def cleanup(self):
         """Cleanup resources"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         
+        if self.cloudscraper:
+            self.cloudscraper.close()
+        
         if self.driver:
-            try:
-                self.driver.quit()
-            except Exception as e:
-                logger.warning(f"Error closing driver: {e}")
+            _release_driver(self.driver)
+            self.driver = None
         
         logger.info("Scraper cleanup completed")
     
-    async def _handle_cloudflare_protection(self):
+    def _probe_cloudflare(self, driver: Optional[webdriver.Chrome] = None):
+        """Check page content, title, and URL for a challenge in the browser"""
+        active, loaded = (driver or self.driver).execute_script(
+            CLOUDFLARE_PROBE_JS, list(CLOUDFLARE_INDICATORS), list(PAGE_LOADED_INDICATORS)
+        )
+        return active, loaded
+    
+    async def _handle_cloudflare_protection(self, driver: Optional[webdriver.Chrome] = None):
         """Detect and handle Cloudflare protection with enhanced detection"""
+        # Use provided driver or fall back to self.driver
+        if driver is None:
+            driver = self.driver
+        
         try:
-            # Enhanced Cloudflare indicators
-            cloudflare_indicators = [
-                "checking your browser before accessing",
-                "please enable cookies and reload the page",
-                "ddos protection by cloudflare",
-                "cf-browser-verification",
-                "challenge-platform",
-                "just a moment",
-                "cloudflare",
-                "unusual traffic",
-                "verify you are human",
-                "checking your browser",
-                "ray id"
-            ]
-            
-            page_text = self.driver.page_source.lower()
-            page_title = self.driver.title.lower()
-            current_url = self.driver.current_url.lower()
-            
-            # Check both page content, title, and URL
-            cloudflare_detected = (
-                any(indicator in page_text for indicator in cloudflare_indicators) or
-                "just a moment" in page_title or
-                "cloudflare" in current_url
-            )
+            cloudflare_detected, _ = self._probe_cloudflare(driver)
             
             if cloudflare_detected:
                 logger.warning("Cloudflare protection detected, implementing enhanced bypass...")
@@ -138,7 +235,7 @@ class BaseScraper(ABC):
                 # Check for interactive challenges
                 try:
                     # Look for verification checkbox
-                    checkbox = self.driver.find_elements(By.CSS_SELECTOR, 'input[type="checkbox"]')
+                    checkbox = driver.find_elements(By.CSS_SELECTOR, 'input[type="checkbox"]')
                     if checkbox:
                         logger.info("Found verification checkbox, attempting to click...")
                         checkbox[0].click()
@@ -154,25 +251,10 @@ class BaseScraper(ABC):
                     await asyncio.sleep(5)  # Wait 5 seconds at a time
                     waited += 5
                     
-                    # Check if challenge is resolved
-                    current_text = self.driver.page_source.lower()
-                    current_title = self.driver.title.lower()
-                    current_url = self.driver.current_url.lower()
-                    
-                    cloudflare_still_active = (
-                        any(indicator in current_text for indicator in cloudflare_indicators) or
-                        "just a moment" in current_title or
-                        "cloudflare" in current_url
-                    )
+                    # Check if challenge is resolved, or the page loaded regardless
+                    cloudflare_still_active, page_loaded = self._probe_cloudflare(driver)
                     
-                    # Also check for signs of successful page load
-                    success_indicators = [
-                        "customer reviews", "add to cart", "price", "rating", 
-                        "product", "newegg", "specifications"
-                    ]
-                    page_loaded_successfully = any(indicator in current_text for indicator in success_indicators)
-                    
-                    if not cloudflare_still_active or page_loaded_successfully:
+                    if not cloudflare_still_active or page_loaded:
                         logger.info(f"Cloudflare protection bypassed successfully after {waited}s")
                         # Wait a bit more for page to fully stabilize
                         await asyncio.sleep(5)
@@ -182,14 +264,13 @@ class BaseScraper(ABC):
                 
                 # If still blocked, try refreshing the page once
                 logger.warning("Cloudflare protection still active, attempting page refresh...")
-                self.driver.refresh()
+                driver.refresh()
                 await asyncio.sleep(15)
                 
                 # Final check after refresh
-                final_text = self.driver.page_source.lower()
-                final_title = self.driver.title.lower()
+                cloudflare_still_active, _ = self._probe_cloudflare(driver)
                 
-                if any(indicator in final_text for indicator in cloudflare_indicators) or "just a moment" in final_title:
+                if cloudflare_still_active:
                     logger.error("Failed to bypass Cloudflare protection after refresh")
                     raise Exception("Cloudflare protection could not be bypassed")
                 else:
@@ -201,6 +282,11 @@ class BaseScraper(ABC):
     
     def _setup_selenium_driver(self) -> webdriver.Chrome:
         """Setup Selenium Chrome driver with optimal configuration for Cloudflare bypass"""
+        driver = _acquire_pooled_driver()
+        if driver is not None:
+            logger.info("Reusing pooled Chrome driver")
+            return driver
+        
         try:
             chrome_options = Options()
             
@@ -225,7 +311,7 @@ class BaseScraper(ABC):
             chrome_options.add_experimental_option("prefs", prefs)
             
             # Use webdriver manager to handle driver installation
-            service = Service(ChromeDriverManager().install())
+            service = Service(_chromedriver_path())
             
             driver = webdriver.Chrome(service=service, options=chrome_options)
             
@@ -258,36 +344,38 @@ class BaseScraper(ABC):
         try:
             await self.rate_limiter.acquire()
             
-            if not self.driver:
-                self.driver = self._setup_selenium_driver()
-            
-            # Set random user agent
-            user_agent = self.utils.get_random_user_agent()
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": user_agent})
-            
-            logger.info(f"Loading page with Selenium: {url}")
-            self.driver.get(url)
-            
-            # Check for and handle Cloudflare protection
-            await self._handle_cloudflare_protection()
-            
-            # Wait for page to load
-            await asyncio.sleep(3)
-            
-            # Wait for specific elements to be present
-            try:
-                WebDriverWait(self.driver, SELENIUM_EXPLICIT_WAIT).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-            except TimeoutException:
-                logger.warning("Page load timeout, proceeding anyway")
-            
-            # Get page source and parse
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Extract data using implementation-specific method
-            data = await self._extract_data_selenium(soup, self.driver)
+            # One page at a time per browser when the scraper is shared
+            async with self._driver_lock:
+                if not self.driver:
+                    self.driver = self._setup_selenium_driver()
+                
+                # Set random user agent
+                user_agent = self.utils.get_random_user_agent()
+                self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": user_agent})
+                
+                logger.info(f"Loading page with Selenium: {url}")
+                self.driver.get(url)
+                
+                # Check for and handle Cloudflare protection
+                await self._handle_cloudflare_protection()
+                
+                # Wait for page to load
+                await asyncio.sleep(3)
+                
+                # Wait for specific elements to be present
+                try:
+                    WebDriverWait(self.driver, SELENIUM_EXPLICIT_WAIT).until(
+                        EC.presence_of_element_located((By.TAG_NAME, "body"))
+                    )
+                except TimeoutException:
+                    logger.warning("Page load timeout, proceeding anyway")
+                
+                # Get page source and parse
+                page_source = self.driver.page_source
+                soup = BeautifulSoup(page_source, HTML_PARSER)
+                
+                # Extract data using implementation-specific method
+                data = await self._extract_data_selenium(soup, self.driver)
             
             return ScrapingResult(
                 success=True,
@@ -313,10 +401,15 @@ class BaseScraper(ABC):
             headers['User-Agent'] = self.utils.get_random_user_agent()
             
             logger.info(f"Fetching with cloudscraper: {url}")
-            response = self.cloudscraper.get(url, headers=headers, timeout=30)
+            # cloudscraper is blocking; run it on the default executor so other scrapes keep going
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None, functools.partial(self.cloudscraper.get, url, headers=headers, timeout=30)
+            )
             response.raise_for_status()
+            self._check_page_size(response.content)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             data = await self._extract_data_requests(soup, response)
             
             return ScrapingResult(
@@ -346,8 +439,9 @@ class BaseScraper(ABC):
             async with self.session.get(url, headers=headers) as response:
                 response.raise_for_status()
                 content = await response.read()
+                self._check_page_size(content)
                 
-                soup = BeautifulSoup(content, 'html.parser')
+                soup = BeautifulSoup(content, HTML_PARSER)
                 data = await self._extract_data_requests(soup, response)
                 
                 return ScrapingResult(
@@ -364,12 +458,22 @@ class BaseScraper(ABC):
                 method_used="aiohttp"
             )
     
+    @staticmethod
+    def _check_page_size(content: bytes):
+        """Reject bodies too small to be a real page so the fallback moves on"""
+        if len(content) < HTTP_MIN_PAGE_BYTES:
+            raise ValueError(
+                f"Response body is only {len(content)} bytes; likely a challenge or interstitial page"
+            )
+    
     async def scrape_with_fallback(self, url: str) -> ScrapingResult:
-        """Try multiple scraping methods with fallback"""
+        """Try multiple scraping methods with fallback, cheapest first"""
+        # Selenium starts Chrome and may wait out a Cloudflare challenge, so it only
+        # runs once both plain HTTP clients have failed
         methods = [
-            ("selenium", self.scrape_with_selenium),
+            ("aiohttp", self.scrape_with_aiohttp),
             ("cloudscraper", self.scrape_with_cloudscraper),
-            ("aiohttp", self.scrape_with_aiohttp)
+            ("selenium", self.scrape_with_selenium)
         ]
         
         last_error = None
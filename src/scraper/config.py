@@ -2,8 +2,14 @@
 Configuration settings for the web scraper
 """
 import os
+import importlib.util
 from typing import List, Dict, Any
 
+try:
+    import soupsieve
+except ImportError:
+    soupsieve = None
+
 # Base configuration
 BASE_URL = "https://www.newegg.com"
 TARGET_URL = "https://www.newegg.com/amd-ryzen-7-9000-series-ryzen-7-9800x3d-granite-ridge-zen-5-socket-am5-desktop-cpu-processor/p/N82E16819113877"
@@ -15,6 +21,19 @@ MAX_CONCURRENT_REQUESTS = 3  # Maximum concurrent requests
 MAX_RETRIES = 3  # Maximum retry attempts
 RETRY_DELAY = 5.0  # Delay between retries (seconds)
 
+# HTTP connection pool (shared aiohttp session)
+HTTP_TIMEOUT = 30  # Total request timeout (seconds)
+HTTP_CONNECT_TIMEOUT = 5  # Timeout for acquiring a connection, including TCP+TLS setup (seconds)
+HTTP_SOCK_READ_TIMEOUT = 20  # Timeout between reads on an open socket (seconds)
+HTTP_POOL_LIMIT = 1024  # Maximum open connections
+HTTP_POOL_LIMIT_PER_HOST = 64  # Maximum open connections per host
+HTTP_KEEPALIVE_TIMEOUT = 30  # Keep idle connections open (seconds)
+HTTP_DNS_CACHE_TTL = 300  # Cache DNS lookups (seconds)
+HTTP_MIN_PAGE_BYTES = 50_000  # Smaller HTTP bodies are challenge/interstitial pages, not product pages
+
+# BeautifulSoup parser: the C-based lxml when installed, else the pure-Python html.parser
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
 # Selenium configuration
 SELENIUM_TIMEOUT = 30  # Page load timeout
 SELENIUM_IMPLICIT_WAIT = 10  # Implicit wait time
@@ -196,6 +215,22 @@ SELECTORS = {
     }
 }
 
+def _compile_selectors(groups: Dict[str, Dict[str, List[str]]]) -> Dict[str, Any]:
+    """Compile every CSS selector once, keyed by its source string"""
+    compiled = {}
+    for group in groups.values():
+        for selectors in group.values():
+            for selector in selectors:
+                try:
+                    compiled[selector] = soupsieve.compile(selector)
+                except soupsieve.SelectorSyntaxError:
+                    # Left uncompiled: select_one() raises and the caller skips it
+                    continue
+    return compiled
+
+# Precompiled soupsieve patterns so bs4 lookups skip selector parsing per page
+COMPILED_SELECTORS = _compile_selectors(SELECTORS) if soupsieve else {}
+
 # XPath selectors as fallback
 XPATH_SELECTORS = {
     "product": {
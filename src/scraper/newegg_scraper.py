@@ -9,7 +9,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
-from bs4 import BeautifulSoup
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -17,11 +18,16 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from .base_scraper import BaseScraper, ScrapingResult
-from .config import SELECTORS, XPATH_SELECTORS, SELENIUM_EXPLICIT_WAIT
+from .config import SELECTORS, COMPILED_SELECTORS, XPATH_SELECTORS, SELENIUM_EXPLICIT_WAIT, HTML_PARSER
 from .utils import ScrapingUtils
 
 logger = logging.getLogger(__name__)
 
+# parse_only filters for the review passes, which never look outside these tags
+JSON_LD_STRAINER = SoupStrainer("script", type="application/ld+json")
+SCRIPT_STRAINER = SoupStrainer("script")
+REVIEW_DIV_STRAINER = SoupStrainer("div")
+
 @dataclass
 class ProductInfo:
     """Product information data class"""
@@ -64,8 +70,8 @@ class ReviewInfo:
 class NeweggScraper(BaseScraper):
     """Specialized scraper for Newegg product pages"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session=session)
         self.utils = ScrapingUtils()
     
     async def _extract_data_selenium(self, soup: BeautifulSoup, driver: webdriver.Chrome) -> Dict[str, Any]:
@@ -502,80 +508,6 @@ class NeweggScraper(BaseScraper):
         
         return None
     
-    async def _handle_cloudflare_protection(self, driver: webdriver.Chrome = None):
-        """Enhanced Cloudflare protection handling"""
-        try:
-            # Use provided driver or fall back to self.driver
-            if driver is None:
-                driver = self.driver
-            
-            logger.info("Handling Cloudflare protection...")
-            
-            # Wait longer for Cloudflare to process
-            await asyncio.sleep(10)  # Initial wait
-            
-            # Check if we need to interact with Cloudflare challenge
-            page_source = driver.page_source.lower()
-            
-            # Look for different types of Cloudflare challenges
-            if 'verify you are human' in page_source:
-                logger.info("Human verification challenge detected")
-                # Try to find and click verification button
-                try:
-                    verify_button = WebDriverWait(driver, 15).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[type="checkbox"]'))
-                    )
-                    verify_button.click()
-                    await asyncio.sleep(5)
-                except TimeoutException:
-                    logger.warning("Could not find verification checkbox")
-            
-            # Wait for Cloudflare to complete processing
-            max_wait_time = 60  # Extended to 60 seconds
-            wait_interval = 5
-            total_waited = 0
-            
-            while total_waited < max_wait_time:
-                await asyncio.sleep(wait_interval)
-                total_waited += wait_interval
-                
-                current_source = driver.page_source.lower()
-                
-                # Check if Cloudflare protection is gone
-                if not any(indicator in current_source for indicator in [
-                    'cloudflare', 'unusual traffic', 'verify you are human', 'checking your browser'
-                ]):
-                    logger.info(f"Cloudflare protection cleared after {total_waited} seconds")
-                    return
-                
-                # Check if we're on a product page (success)
-                if any(indicator in current_source for indicator in [
-                    'customer reviews', 'rating', 'price', 'add to cart'
-                ]):
-                    logger.info("Successfully bypassed Cloudflare protection")
-                    return
-                
-                logger.info(f"Still waiting for Cloudflare... ({total_waited}/{max_wait_time}s)")
-            
-            # If we're still blocked, try refreshing the page
-            logger.warning("Cloudflare protection still active, trying page refresh...")
-            driver.refresh()
-            await asyncio.sleep(15)
-            
-            # Final check
-            final_source = driver.page_source.lower()
-            if any(indicator in final_source for indicator in [
-                'cloudflare', 'unusual traffic', 'verify you are human'
-            ]):
-                logger.error("Failed to bypass Cloudflare protection after all attempts")
-                raise Exception("Cloudflare protection could not be bypassed")
-            else:
-                logger.info("Cloudflare protection bypassed after page refresh")
-                
-        except Exception as e:
-            logger.error(f"Error handling Cloudflare protection: {e}")
-            raise
-
     def _extract_reviews_from_json_simple(self, driver: webdriver.Chrome) -> List[Dict[str, Any]]:
         """Simplified JSON extraction focusing on most common patterns"""
         reviews = []
@@ -682,7 +614,7 @@ class NeweggScraper(BaseScraper):
                     continue
             
             # If regex patterns don't work, try to find script tags and look for review objects
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, HTML_PARSER, parse_only=SCRIPT_STRAINER)
             script_tags = soup.find_all('script', string=lambda text: text and ('Review' in text or 'rating' in text or 'Comments' in text))
             
             for script in script_tags[:10]:  # Limit to first 10 script tags
@@ -863,14 +795,12 @@ class NeweggScraper(BaseScraper):
         reviews = []
         
         try:
-            # Check for Cloudflare protection first
-            page_source = driver.page_source
-            if any(indicator in page_source.lower() for indicator in [
-                'cloudflare', 'unusual traffic', 'verify you are human', 'checking your browser'
-            ]):
+            # Check for Cloudflare protection first (in the browser, without fetching the source)
+            cloudflare_detected, _ = self._probe_cloudflare(driver)
+            if cloudflare_detected:
                 logger.warning("Cloudflare protection detected, attempting to handle...")
                 await self._handle_cloudflare_protection(driver)
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
+                soup = BeautifulSoup(driver.page_source, HTML_PARSER, parse_only=JSON_LD_STRAINER)
             
             # Try JSON-LD extraction first (most reliable)
             logger.info("Attempting JSON-LD extraction...")
@@ -891,7 +821,7 @@ class NeweggScraper(BaseScraper):
             await self._navigate_to_reviews_section(driver)
             
             # Get updated page source
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            soup = BeautifulSoup(driver.page_source, HTML_PARSER, parse_only=REVIEW_DIV_STRAINER)
             logger.info(f"Current URL: {driver.current_url}")
             
             # Use multiple simple strategies to find reviews
@@ -1362,7 +1292,8 @@ class NeweggScraper(BaseScraper):
         """Extract text from element using CSS selectors"""
         for selector in selectors:
             try:
-                element = parent_element.select_one(selector)
+                compiled = COMPILED_SELECTORS.get(selector)
+                element = compiled.select_one(parent_element) if compiled else parent_element.select_one(selector)
                 if element:
                     text = element.get_text(strip=True)
                     return self.utils.clean_text(text) if text else None
@@ -14,6 +14,8 @@ import hashlib
 from fake_useragent import UserAgent
 from bs4 import BeautifulSoup
 
+from .config import COMPILED_SELECTORS
+
 logger = logging.getLogger(__name__)
 
 class ScrapingUtils:
@@ -180,7 +182,8 @@ class ScrapingUtils:
         for selector in selectors:
             try:
                 if method == 'css':
-                    element = soup.select_one(selector)
+                    compiled = COMPILED_SELECTORS.get(selector)
+                    element = compiled.select_one(soup) if compiled else soup.select_one(selector)
                     if element:
                         return element
                 elif method == 'xpath':
@@ -199,7 +202,8 @@ class ScrapingUtils:
         for selector in selectors:
             try:
                 if method == 'css':
-                    elements = soup.select(selector)
+                    compiled = COMPILED_SELECTORS.get(selector)
+                    elements = compiled.select(soup) if compiled else soup.select(selector)
                     if elements:
                         return elements
                 elif method == 'xpath':
@@ -272,35 +276,28 @@ class RetryHelper:
         raise last_exception
 
 class RateLimiter:
-    """Simple rate limiter for API calls"""
+    """Token-bucket rate limiter: bursts up to max_calls, refills at max_calls/time_window"""
     
     def __init__(self, max_calls: int = 10, time_window: float = 60.0):
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls = []
-        self._lock = asyncio.Lock()
+        self.rate = max_calls / time_window
+        self.tokens = float(max_calls)
+        self.last_refill = time.monotonic()
     
-    async def acquire(self):
+    async def acquire(self, cost: float = 1.0):
         """Acquire rate limit permission"""
-        async with self._lock:
-            now = time.time()
-            
-            # Remove old calls outside the time window
-            self.calls = [call_time for call_time in self.calls if now - call_time < self.time_window]
-            
-            # Check if we can make a call
-            if len(self.calls) < self.max_calls:
-                self.calls.append(now)
-                return
-            
-            # Calculate wait time
-            oldest_call = min(self.calls)
-            wait_time = self.time_window - (now - oldest_call)
-            
-            if wait_time > 0:
-                logger.info(f"Rate limit reached. Waiting {wait_time:.2f}s")
-                await asyncio.sleep(wait_time)
-                await self.acquire()  # Recursive call after waiting
+        # No await before the reservation, so it is atomic on the event loop; callers
+        # that overdraw the bucket each sleep off their own deficit concurrently
+        now = time.monotonic()
+        self.tokens = min(self.max_calls, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        self.tokens -= cost
+        
+        if self.tokens < 0:
+            wait_time = -self.tokens / self.rate
+            logger.info(f"Rate limit reached. Waiting {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """Setup logging configuration"""
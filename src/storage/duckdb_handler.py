@@ -2,18 +2,243 @@
 DuckDB handler for analytics and bonus analysis
 """
 import os
+import csv
+import glob
+import json
+import hashlib
 import logging
+import functools
+import threading
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from decimal import Decimal
 import pandas as pd
 
+from .serialization import json_default
+
 try:
     import duckdb
 except ImportError:
     duckdb = None
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 logger = logging.getLogger(__name__)
 
+# Memory cap for bulk loads; DuckDB spills to disk beyond it instead of failing
+DUCKDB_MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT", "4GB")
+
+# Reader options shared by every scan of the Amazon dataset CSV
+CSV_READ_OPTIONS = """
+    header=true,
+    delim=',',
+    quote='"',
+    escape='"',
+    null_padding=true,
+    ignore_errors=true,
+    max_line_size=1048576,
+    sample_size=50000,
+    types={'category': 'VARCHAR', 'rating': 'DOUBLE'}
+"""
+
+# Per-category rating statistics (optimized for large datasets using CTEs)
+CATEGORY_ANALYSIS_QUERY = """
+    WITH category_stats AS (
+        SELECT 
+            category,
+            COUNT(*) as product_count,
+            AVG(rating) as avg_rating,
+            STDDEV_POP(rating) as rating_stddev,
+            VAR_POP(rating) as rating_variance,
+            MIN(rating) as min_rating,
+            MAX(rating) as max_rating,
+            MEDIAN(rating) as median_rating,
+            COUNT(*) FILTER (WHERE rating >= 4.0) as high_rating_count,
+            PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY rating) as q1_rating,
+            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY rating) as q3_rating
+        FROM amazon_products 
+        WHERE rating IS NOT NULL 
+        AND category IS NOT NULL
+        AND category != ''
+        GROUP BY category
+        HAVING COUNT(*) >= 1  -- Include all categories for analysis
+    ),
+    overall_stats AS (
+        SELECT 
+            AVG(rating) as overall_avg,
+            STDDEV_POP(rating) as overall_stddev
+        FROM amazon_products 
+        WHERE rating IS NOT NULL
+    )
+    SELECT 
+        cs.category,
+        cs.product_count,
+        ROUND(cs.avg_rating, 3) as avg_rating,
+        ROUND(cs.rating_stddev, 3) as rating_stddev,
+        ROUND(cs.rating_variance, 3) as rating_variance,
+        ROUND(cs.rating_stddev / NULLIF(cs.avg_rating, 0), 3) as coefficient_of_variation,
+        cs.min_rating,
+        cs.max_rating,
+        ROUND(cs.median_rating, 1) as median_rating,
+        ROUND((cs.high_rating_count * 100.0 / cs.product_count), 1) as high_rating_percentage,
+        ROUND(cs.q1_rating, 1) as q1_rating,
+        ROUND(cs.q3_rating, 1) as q3_rating,
+        ROUND(cs.q3_rating - cs.q1_rating, 1) as iqr,
+        ROUND((cs.avg_rating - os.overall_avg) / NULLIF(os.overall_stddev, 0), 2) as z_score,
+        CASE 
+            WHEN ABS((cs.avg_rating - os.overall_avg) / NULLIF(os.overall_stddev, 0)) > 2 THEN 'Significant'
+            WHEN ABS((cs.avg_rating - os.overall_avg) / NULLIF(os.overall_stddev, 0)) > 1 THEN 'Notable'
+            ELSE 'Normal'
+        END as significance_level
+    FROM category_stats cs
+    CROSS JOIN overall_stats os
+    ORDER BY cs.avg_rating DESC NULLS LAST, cs.product_count DESC
+    """
+
+# Name of the persisted category stats result; renamed whenever CATEGORY_ANALYSIS_QUERY's columns change
+CATEGORY_STATS_NAME = "category_stats_v2"
+
+# Read back the materialized category statistics in the query's order
+CATEGORY_STATS_SELECT = """
+    SELECT * FROM category_stats_cache
+    ORDER BY avg_rating DESC NULLS LAST, product_count DESC
+    """
+
+# Top/bottom-k categories per variability metric, tagged by kind, plus summary stats
+VARIABILITY_TOPK_QUERY = """
+    SELECT kind, category, value FROM (
+        SELECT 'highest_variance' as kind, category, rating_variance as value,
+               ROW_NUMBER() OVER (ORDER BY rating_variance DESC NULLS LAST) as rank
+        FROM category_stats_cache
+        UNION ALL
+        SELECT 'lowest_variance', category, rating_variance,
+               ROW_NUMBER() OVER (ORDER BY rating_variance ASC NULLS LAST)
+        FROM category_stats_cache
+        UNION ALL
+        SELECT 'highest_stddev', category, rating_stddev,
+               ROW_NUMBER() OVER (ORDER BY rating_stddev DESC NULLS LAST)
+        FROM category_stats_cache
+        UNION ALL
+        SELECT 'most_consistent', category, rating_stddev,
+               ROW_NUMBER() OVER (ORDER BY rating_stddev ASC NULLS LAST)
+        FROM category_stats_cache
+        UNION ALL
+        SELECT 'highest_cv', category, coefficient_of_variation,
+               ROW_NUMBER() OVER (ORDER BY coefficient_of_variation DESC NULLS LAST)
+        FROM category_stats_cache
+        WHERE coefficient_of_variation IS NOT NULL
+    )
+    WHERE rank <= ?
+    ORDER BY kind, rank
+    """
+
+# First and last k rows of the CATEGORY_STATS_SELECT order; 'bottom' ranks count from the end
+CATEGORY_EXTREMES_QUERY = """
+    SELECT kind, category, avg_rating, product_count FROM (
+        SELECT 'top' as kind, category, avg_rating, product_count,
+               ROW_NUMBER() OVER (ORDER BY avg_rating DESC NULLS LAST, product_count DESC) as rank
+        FROM category_stats_cache
+        UNION ALL
+        SELECT 'bottom', category, avg_rating, product_count,
+               ROW_NUMBER() OVER (ORDER BY avg_rating ASC NULLS FIRST, product_count ASC)
+        FROM category_stats_cache
+    )
+    WHERE rank <= ?
+    ORDER BY kind, rank
+    """
+
+VARIABILITY_SUMMARY_QUERY = """
+    SELECT 
+        AVG(rating_variance) as mean_variance,
+        AVG(rating_stddev) as mean_stddev,
+        MIN(rating_variance) as min_variance,
+        MAX(rating_variance) as max_variance
+    FROM category_stats_cache
+    """
+
+def _sql_literal(value: str) -> str:
+    """Quote a string (e.g. a file path) as a SQL literal"""
+    return "'" + value.replace("'", "''") + "'"
+
+def _arrow_records(cursor) -> List[Dict[str, Any]]:
+    """Fetch a query result as Arrow and build row dicts in C, with DECIMALs as floats"""
+    table = cursor.arrow()
+    if not isinstance(table, pa.Table):  # Newer DuckDB returns a RecordBatchReader
+        table = table.read_all()
+    
+    # Decimal -> string -> float64 rounds like float(Decimal); a direct cast can be off by an ulp
+    for index, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            column = table.column(index).cast(pa.string()).cast(pa.float64())
+            table = table.set_column(index, field.name, column)
+    return table.to_pylist()
+
+def _write_records_csv(path: str, records: List[Dict[str, Any]]):
+    """Write row dicts to a CSV file in one pass, using the first row's keys as header"""
+    if not records:
+        return
+    
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+
+def _source_fingerprint(path: str) -> str:
+    """Identify a dataset file by absolute path and modification time"""
+    return f"{os.path.abspath(path)}:{os.path.getmtime(path)}"
+
+def convert_csv_to_parquet(csv_path: str, parquet_path: Optional[str] = None) -> Optional[str]:
+    """
+    Convert a dataset CSV to ZSTD-compressed Parquet next to it
+    Skipped when an up-to-date Parquet file already exists
+    
+    Returns:
+        Path to the Parquet file, or None if the conversion failed
+    """
+    parquet_path = parquet_path or os.path.splitext(csv_path)[0] + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return parquet_path
+    
+    if duckdb is None:
+        return None
+    
+    tmp_path = parquet_path + ".tmp"
+    try:
+        logger.info("Converting %s to Parquet (one-time)...", csv_path)
+        conn = duckdb.connect()
+        try:
+            # Parallel CSV scan on every core; row order doesn't matter for the copy
+            conn.execute(f"PRAGMA threads={os.cpu_count() or 4}")
+            conn.execute(f"PRAGMA memory_limit='{DUCKDB_MEMORY_LIMIT}'")
+            conn.execute("SET preserve_insertion_order=false")
+            conn.execute(f"""
+                COPY (SELECT * FROM read_csv_auto({_sql_literal(csv_path)}, {CSV_READ_OPTIONS}))
+                TO {_sql_literal(tmp_path)} (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 100000)
+            """)
+        finally:
+            conn.close()
+        
+        os.replace(tmp_path, parquet_path)
+        logger.info("Wrote %s", parquet_path)
+        return parquet_path
+        
+    except Exception as e:
+        logger.warning(f"Could not convert {csv_path} to Parquet: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+def _serialized(method):
+    """Run a handler method while holding the lock on the shared connection"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._conn_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class DuckDBHandler:
     """DuckDB handler for analytics workloads"""
     
@@ -22,8 +247,20 @@ class DuckDBHandler:
             raise ImportError("DuckDB not installed. Please install with: pip install duckdb")
         
         self.db_path = db_path
+        # Full-scan results (and the category stats) persisted across restarts,
+        # keyed by the table's content
+        self.results_cache_dir = f"{db_path}_cache"
         self.ensure_directory()
         self.conn = None
+        # A DuckDBPyConnection is not thread-safe: methods using self.conn hold this
+        # lock, work on other threads goes through cursor()
+        self._conn_lock = threading.RLock()
+        self._cursor_factory = None  # Second connection that only spawns worker cursors
+        self._cursor_factory_lock = threading.Lock()
+        self.dataset_version = 0  # Bumped whenever amazon_products is reloaded
+        self._result_cache: Dict[str, Tuple[int, Any]] = {}  # key -> (dataset_version, result)
+        self._category_stats_key: Optional[str] = None  # Content key category_stats_cache was built for
+        self.amazon_row_count: Optional[int] = None  # Rows loaded by the last load_amazon_dataset
         self.init_database()
     
     def ensure_directory(self):
@@ -34,8 +271,24 @@ class DuckDBHandler:
         """Connect to DuckDB database"""
         if self.conn is None:
             self.conn = duckdb.connect(self.db_path)
+            # Reuse Parquet footers/metadata across the repeated read_parquet scans
+            # (validation, load, category stats); newer DuckDB versions cache them anyway
+            self.conn.execute("SET enable_object_cache=true")
+            # cursor() spawns from this instead of self.conn, so it never waits for
+            # _conn_lock while a serialized query holds the shared connection
+            self._cursor_factory = self.conn.cursor()
         return self.conn
     
+    def cursor(self):
+        """New cursor on the shared database for use on another thread; close it when done"""
+        factory = self._cursor_factory
+        if factory is None:
+            with self._conn_lock:
+                self.connect()
+                factory = self._cursor_factory
+        with self._cursor_factory_lock:
+            return factory.cursor()
+    
     def init_database(self):
         """Initialize DuckDB with analytics tables"""
         conn = self.connect()
@@ -99,12 +352,21 @@ class DuckDBHandler:
                 )
             """)
             
+            # Key/value metadata about the loaded dataset (e.g. its source file)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dataset_metadata (
+                    key VARCHAR PRIMARY KEY,
+                    value VARCHAR
+                )
+            """)
+            
             logger.info("DuckDB analytics database initialized")
             
         except Exception as e:
             logger.error(f"Error initializing DuckDB: {e}")
             raise
     
+    @_serialized
     def import_from_sqlite(self, sqlite_path: str):
         """Import data from SQLite database"""
         conn = self.connect()
@@ -114,6 +376,9 @@ class DuckDBHandler:
             conn.execute("INSTALL sqlite;")
             conn.execute("LOAD sqlite;")
             
+            # Rows are copied set-based by sqlite_scan, never fetched into Python
+            source = _sql_literal(sqlite_path)
+            
             # Import products
             conn.execute(f"""
                 INSERT OR REPLACE INTO products_analytics 
@@ -129,7 +394,7 @@ class DuckDBHandler:
                         ELSE 'Other'
                     END as category,
                     url, scraped_at, created_at
-                FROM sqlite_scan('{sqlite_path}', 'products')
+                FROM sqlite_scan({source}, 'products')
             """)
             
             # Import reviews
@@ -141,7 +406,7 @@ class DuckDBHandler:
                     NULL as sentiment_score,
                     LENGTH(body) as review_length,
                     scraped_at, created_at
-                FROM sqlite_scan('{sqlite_path}', 'reviews')
+                FROM sqlite_scan({source}, 'reviews')
             """)
             
             logger.info("Successfully imported data from SQLite to DuckDB")
@@ -150,10 +415,61 @@ class DuckDBHandler:
             logger.error(f"Error importing from SQLite: {e}")
             raise
     
-    def load_amazon_dataset(self, csv_path: str, chunk_size: int = 100000) -> bool:
+    def dataset_source(self, path: str) -> Tuple[str, List[str]]:
+        """
+        SQL table expression for reading the Amazon dataset, with the file path bound
+        as a parameter (pass the returned list to execute)
+        CSVs are converted to Parquet on first use so later scans skip CSV parsing
+        """
+        if path.endswith('.csv'):
+            path = convert_csv_to_parquet(path) or path
+        
+        if path.endswith('.parquet'):
+            return "read_parquet(?)", [path]
+        return f"read_csv_auto(?, {CSV_READ_OPTIONS})", [path]
+    
+    @_serialized
+    def loaded_source(self) -> Optional[str]:
+        """Fingerprint (path and mtime) of the file amazon_products was last loaded from"""
+        try:
+            row = self.connect().execute(
+                "SELECT value FROM dataset_metadata WHERE key = 'amazon_source'"
+            ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Error reading dataset metadata: {e}")
+            return None
+    
+    @_serialized
+    def amazon_dataset_loaded(self, csv_path: Optional[str] = None) -> bool:
+        """
+        Whether amazon_products already holds data, loaded from csv_path as it is now
+        When csv_path is missing on disk any populated table counts as loaded
+        """
+        conn = self.connect()
+        
+        try:
+            if not conn.execute("SELECT EXISTS (SELECT 1 FROM amazon_products)").fetchone()[0]:
+                return False
+            
+            if csv_path is None or not os.path.exists(csv_path):
+                return True
+            
+            return self.loaded_source() == _source_fingerprint(csv_path)
+            
+        except Exception as e:
+            logger.error(f"Error checking loaded Amazon dataset: {e}")
+            return False
+    
+    @_serialized
+    def load_amazon_dataset(self, csv_path: str, chunk_size: int = 100000,
+                            include_text_columns: bool = False) -> bool:
         """
         Load Amazon UK dataset for bonus analysis with optimized chunked processing
         Handles large datasets efficiently for scalability
+        
+        Only the columns the analysis queries use are loaded unless include_text_columns
+        is set; the free-text, user and link columns are left NULL
         """
         if not os.path.exists(csv_path):
             logger.warning(f"Amazon dataset not found at {csv_path}")
@@ -162,53 +478,81 @@ class DuckDBHandler:
         conn = self.connect()
         
         try:
-            # Clear existing data
+            # Enable parallel processing and optimize for large datasets
+            conn.execute(f"PRAGMA threads={os.cpu_count() or 4}")  # Use all cores for the CSV scan
+            conn.execute(f"PRAGMA memory_limit='{DUCKDB_MEMORY_LIMIT}'")  # Increase memory limit
+            # Scan in parallel without holding rows back to keep file order (the
+            # explicit ORDER BY below still decides the stored order)
+            conn.execute("SET preserve_insertion_order=false")
+            
+            # Indexes are rebuilt once after the load instead of maintained per row
+            self._drop_performance_indexes()
+            
+            # Read from the cached Parquet copy when possible, otherwise the CSV
+            source, source_params = self.dataset_source(csv_path)
+            logger.info("Loading large dataset from %s with chunked processing...", csv_path)
+            
+            # The persisted category stats stay valid while the source file is unchanged
+            source_fingerprint = _source_fingerprint(csv_path)
+            
+            # Replace existing data atomically so a failed load keeps the old dataset
+            conn.execute("BEGIN TRANSACTION")
+            previous = conn.execute(
+                "SELECT value FROM dataset_metadata WHERE key = 'amazon_source'"
+            ).fetchone()
             conn.execute("DELETE FROM amazon_products")
             
-            # Enable parallel processing and optimize for large datasets
-            conn.execute("PRAGMA threads=4")  # Use multiple threads
-            conn.execute("PRAGMA memory_limit='4GB'")  # Increase memory limit
+            # Sequence IDs instead of ROW_NUMBER() OVER (), which would add a second
+            # whole-input buffering step on top of the clustering sort below
+            conn.execute("DROP SEQUENCE IF EXISTS amazon_products_id_seq")
+            conn.execute("CREATE SEQUENCE amazon_products_id_seq START 1")
             
-            # Use DuckDB's efficient CSV reader with optimizations
-            logger.info(f"Loading large dataset from {csv_path} with chunked processing...")
+            # Wide text columns dominate parse and storage cost but no query reads them
+            text_columns = ""
+            if include_text_columns:
+                text_columns = """,
+                    about_product, user_id, user_name,
+                    review_id, review_title, review_content, img_link, product_link"""
             
-            # Load CSV data with explicit column mapping and optimized settings
+            # Load CSV data with explicit column mapping and optimized settings.
+            # Clustering by category keeps row-group min/max zonemaps tight for filters,
+            # at the cost of a full sort of the filtered input: the load is no longer
+            # a pure stream, and beyond DUCKDB_MEMORY_LIMIT the sort spills to
+            # temporary files on disk instead of running out of memory
             conn.execute(f"""
                 INSERT INTO amazon_products (
                     id, title, category, discounted_price, actual_price, discount_percentage,
-                    rating, rating_count, about_product, user_id, user_name,
-                    review_id, review_title, review_content, img_link, product_link
+                    rating, rating_count{text_columns}
                 )
                 SELECT 
-                    ROW_NUMBER() OVER() as id,
+                    nextval('amazon_products_id_seq') as id,
                     title, 
                     COALESCE(category, 'Unknown') as category,
                     CAST(discounted_price AS DECIMAL(10,2)) as discounted_price,
                     CAST(actual_price AS DECIMAL(10,2)) as actual_price,
                     CAST(discount_percentage AS DECIMAL(5,2)) as discount_percentage,
                     CAST(rating AS DECIMAL(3,2)) as rating,
-                    CAST(rating_count AS INTEGER) as rating_count,
-                    about_product, user_id, user_name,
-                    review_id, review_title, review_content, img_link, product_link
-                FROM read_csv_auto(
-                    '{csv_path}',
-                    header=true,
-                    delim=',',
-                    quote='"',
-                    escape='"',
-                    null_padding=true,
-                    ignore_errors=true,
-                    max_line_size=1048576,
-                    sample_size=50000
-                )
+                    CAST(rating_count AS INTEGER) as rating_count{text_columns}
+                FROM {source}
                 WHERE rating IS NOT NULL 
                 AND rating > 0 
                 AND category IS NOT NULL
-            """)
+                ORDER BY category, rating
+            """, source_params)
+            conn.execute(
+                "INSERT OR REPLACE INTO dataset_metadata VALUES ('amazon_source', ?)",
+                [source_fingerprint]
+            )
+            conn.execute("COMMIT")
+            self.dataset_version += 1
+            
+            if previous is None or previous[0] != source_fingerprint:
+                self._invalidate_persisted_results()
             
             # Get row count and statistics
             result = conn.execute("SELECT COUNT(*) FROM amazon_products").fetchone()
             row_count = result[0] if result else 0
+            self.amazon_row_count = row_count
             
             # Get category statistics for validation
             category_stats = conn.execute("""
@@ -220,10 +564,9 @@ class DuckDBHandler:
                 FROM amazon_products
             """).fetchone()
             
-            logger.info(f"Successfully loaded {row_count:,} Amazon products into DuckDB")
-            logger.info(f"Dataset statistics: {category_stats[0]} categories, "
-                       f"ratings range: {category_stats[1]:.1f}-{category_stats[2]:.1f}, "
-                       f"average: {category_stats[3]:.2f}")
+            logger.info("Successfully loaded %d Amazon products into DuckDB", row_count)
+            logger.info("Dataset statistics: %s categories, ratings range: %.1f-%.1f, average: %.2f",
+                        *category_stats)
             
             # Create indexes for performance
             self._create_performance_indexes()
@@ -232,7 +575,22 @@ class DuckDBHandler:
             
         except Exception as e:
             logger.error(f"Error loading Amazon dataset: {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass  # No transaction was open
+            self._create_performance_indexes()
             return False
+        
+        finally:
+            conn.execute("RESET preserve_insertion_order")
+    
+    def _drop_performance_indexes(self):
+        """Drop the amazon_products indexes before a bulk load"""
+        conn = self.connect()
+        
+        for index_name in ("idx_category", "idx_rating", "idx_category_rating"):
+            conn.execute(f"DROP INDEX IF EXISTS {index_name}")
     
     def _create_performance_indexes(self):
         """Create indexes for optimal query performance on large datasets"""
@@ -249,88 +607,411 @@ class DuckDBHandler:
         except Exception as e:
             logger.warning(f"Could not create all indexes: {e}")
     
+    @_serialized
     def get_category_analysis(self) -> pd.DataFrame:
         """
         Perform comprehensive category-based analysis optimized for large datasets
         Includes advanced statistical measures and scalable query design
+        Results are cached until the dataset is reloaded
         """
+        cached = self._get_cached('category_analysis')
+        if cached is not None:
+            # Callers may add columns, so hand out a copy
+            return cached.copy()
+        
         conn = self.connect()
         
         try:
-            # Optimized query for large datasets using window functions and CTEs
-            query = """
-            WITH category_stats AS (
-                SELECT 
-                    category,
-                    COUNT(*) as product_count,
-                    AVG(rating) as avg_rating,
-                    STDDEV_POP(rating) as rating_stddev,
-                    VAR_POP(rating) as rating_variance,
-                    MIN(rating) as min_rating,
-                    MAX(rating) as max_rating,
-                    MEDIAN(rating) as median_rating,
-                    COUNT(*) FILTER (WHERE rating >= 4.0) as high_rating_count,
-                    PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY rating) as q1_rating,
-                    PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY rating) as q3_rating
-                FROM amazon_products 
-                WHERE rating IS NOT NULL 
-                AND category IS NOT NULL
-                AND category != ''
-                GROUP BY category
-                HAVING COUNT(*) >= 1  -- Include all categories for analysis
-            ),
-            overall_stats AS (
-                SELECT 
-                    AVG(rating) as overall_avg,
-                    STDDEV_POP(rating) as overall_stddev
-                FROM amazon_products 
-                WHERE rating IS NOT NULL
-            )
-            SELECT 
-                cs.category,
-                cs.product_count,
-                ROUND(cs.avg_rating, 3) as avg_rating,
-                ROUND(cs.rating_stddev, 3) as rating_stddev,
-                ROUND(cs.rating_variance, 3) as rating_variance,
-                cs.min_rating,
-                cs.max_rating,
-                ROUND(cs.median_rating, 1) as median_rating,
-                ROUND((cs.high_rating_count * 100.0 / cs.product_count), 1) as high_rating_percentage,
-                ROUND(cs.q1_rating, 1) as q1_rating,
-                ROUND(cs.q3_rating, 1) as q3_rating,
-                ROUND(cs.q3_rating - cs.q1_rating, 1) as iqr,
-                ROUND((cs.avg_rating - os.overall_avg) / NULLIF(os.overall_stddev, 0), 2) as z_score,
-                CASE 
-                    WHEN ABS((cs.avg_rating - os.overall_avg) / NULLIF(os.overall_stddev, 0)) > 2 THEN 'Significant'
-                    WHEN ABS((cs.avg_rating - os.overall_avg) / NULLIF(os.overall_stddev, 0)) > 1 THEN 'Notable'
-                    ELSE 'Normal'
-                END as significance_level
-            FROM category_stats cs
-            CROSS JOIN overall_stats os
-            ORDER BY cs.avg_rating DESC, cs.product_count DESC
-            """
-            
-            result = conn.execute(query).df()
+            self._refresh_category_stats(conn)
+            result = conn.execute(CATEGORY_STATS_SELECT).df()
             
             if result.empty:
                 logger.warning("No category analysis data returned")
                 return pd.DataFrame()
             
-            logger.info(f"Category analysis completed for {len(result)} categories")
-            return result
+            logger.info("Category analysis completed for %d categories", len(result))
+            self._set_cached('category_analysis', result)
+            return result.copy()
             
         except Exception as e:
             logger.error(f"Error in category analysis: {e}")
             return pd.DataFrame()
     
+    @_serialized
+    def get_category_analysis_records(self) -> List[Dict[str, Any]]:
+        """
+        Category statistics as plain row dicts, fetched without a pandas DataFrame
+        Results are cached until the dataset is reloaded
+        """
+        cached = self._get_cached('category_analysis_records')
+        if cached is not None:
+            return list(cached)
+        
+        conn = self.connect()
+        
+        try:
+            self._refresh_category_stats(conn)
+            cursor = conn.execute(CATEGORY_STATS_SELECT)
+            if pa is not None:
+                records = _arrow_records(cursor)
+            else:
+                columns = [column[0] for column in cursor.description]
+                records = [
+                    {name: float(value) if isinstance(value, Decimal) else value
+                     for name, value in zip(columns, row)}
+                    for row in cursor.fetchall()
+                ]
+            
+            if records:
+                self._set_cached('category_analysis_records', records)
+            return list(records)
+            
+        except Exception as e:
+            logger.error(f"Error in category analysis: {e}")
+            return []
+    
+    @_serialized
+    def get_category_summary(self, overall_avg: float) -> Dict[str, Any]:
+        """
+        Highest/lowest rated and most/least variable categories, plus the categories
+        picked for recommendations, computed in one SQL pass over the category stats
+        
+        Args:
+            overall_avg: Overall average rating used for the performance thresholds
+        """
+        conn = self.connect()
+        
+        try:
+            self._refresh_category_stats(conn)
+            cursor = conn.execute("""
+                SELECT 
+                    COUNT(*) as total_categories,
+                    ARG_MAX(category, avg_rating) as highest_rated_category,
+                    MAX(avg_rating) as highest_avg_rating,
+                    ARG_MAX(product_count, avg_rating) as highest_rated_count,
+                    ARG_MIN(category, avg_rating) as lowest_rated_category,
+                    MIN(avg_rating) as lowest_avg_rating,
+                    ARG_MIN(product_count, avg_rating) as lowest_rated_count,
+                    ARG_MAX(category, rating_stddev) as highest_variability_category,
+                    MAX(rating_stddev) as highest_stddev,
+                    ARG_MAX(rating_variance, rating_stddev) as highest_variance,
+                    ARG_MIN(category, rating_stddev) as lowest_variability_category,
+                    MIN(rating_stddev) as lowest_stddev,
+                    ARG_MIN(rating_variance, rating_stddev) as lowest_variance,
+                    ARG_MAX(category, avg_rating) FILTER (WHERE avg_rating > ? + 0.2) as high_performer,
+                    MAX(avg_rating) FILTER (WHERE avg_rating > ? + 0.2) as high_performer_rating,
+                    ARG_MIN(category, avg_rating) FILTER (WHERE avg_rating < ? - 0.2) as low_performer,
+                    MIN(avg_rating) FILTER (WHERE avg_rating < ? - 0.2) as low_performer_rating,
+                    ARG_MAX(category, avg_rating) FILTER (WHERE rating_stddev > 1.0) as variable_category,
+                    ARG_MAX(rating_stddev, avg_rating) FILTER (WHERE rating_stddev > 1.0) as variable_stddev,
+                    ARG_MAX(category, avg_rating) FILTER (WHERE rating_stddev < 0.5) as consistent_category
+                FROM category_stats_cache
+            """, [overall_avg] * 4)
+            
+            columns = [column[0] for column in cursor.description]
+            row = cursor.fetchone()
+            return dict(zip(columns, row)) if row else {}
+            
+        except Exception as e:
+            logger.error(f"Error in category summary: {e}")
+            return {}
+    
+    @_serialized
+    def get_category_z_scores(self, limit: int = 2, min_abs_z: float = 2.0) -> List[Dict[str, Any]]:
+        """
+        Categories whose average rating deviates most from the other categories,
+        scored with window functions over the category stats and sorted by |z|
+        
+        Args:
+            limit: Maximum number of categories to return
+            min_abs_z: Only return categories with |z| above this threshold
+        """
+        conn = self.connect()
+        
+        try:
+            self._refresh_category_stats(conn)
+            cursor = conn.execute("""
+                SELECT 
+                    category,
+                    avg_rating,
+                    rating_stddev,
+                    (avg_rating - AVG(avg_rating) OVER ()) / NULLIF(STDDEV_POP(avg_rating) OVER (), 0) as z
+                FROM category_stats_cache
+                QUALIFY ABS(z) > ?
+                ORDER BY ABS(z) DESC
+                LIMIT ?
+            """, [min_abs_z, limit])
+            
+            columns = [column[0] for column in cursor.description]
+            return [
+                {name: float(value) if isinstance(value, Decimal) else value
+                 for name, value in zip(columns, row)}
+                for row in cursor.fetchall()
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error in category z-score analysis: {e}")
+            return []
+    
+    @_serialized
+    def get_variability_topk(self, k: int = 5) -> Tuple[List[Tuple[str, str, float]], Dict[str, Any]]:
+        """
+        Top/bottom-k categories by variance, standard deviation and coefficient of
+        variation as (kind, category, value) rows, plus the variability summary stats
+        Both queries only read the materialized category stats
+        """
+        conn = self.connect()
+        
+        try:
+            self._refresh_category_stats(conn)
+            rows = conn.execute(VARIABILITY_TOPK_QUERY, [k]).fetchall()
+            
+            cursor = conn.execute(VARIABILITY_SUMMARY_QUERY)
+            columns = [column[0] for column in cursor.description]
+            summary = dict(zip(columns, cursor.fetchone()))
+            return rows, summary
+            
+        except Exception as e:
+            logger.error(f"Error in variability analysis: {e}")
+            return [], {}
+    
+    @_serialized
+    def export_category_stats(self, path: str, file_format: str = "csv") -> bool:
+        """
+        Write the category statistics straight from DuckDB with COPY
+        
+        Args:
+            path: Output file path
+            file_format: "csv" (with header), "parquet" (zstd-compressed) or "json" (array of rows)
+        """
+        conn = self.connect()
+        options = {
+            "parquet": "FORMAT PARQUET, COMPRESSION ZSTD",
+            "json": "FORMAT JSON, ARRAY true",
+        }.get(file_format, "HEADER, DELIMITER ','")
+        # COPY to a temp file and rename, so readers never see a partial export
+        partial = path + ".tmp"
+        
+        try:
+            self._refresh_category_stats(conn)
+            conn.execute(f"COPY ({CATEGORY_STATS_SELECT}) TO {_sql_literal(partial)} ({options})")
+            os.replace(partial, path)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error exporting category stats to {path}: {e}")
+            if os.path.exists(partial):
+                os.remove(partial)
+            return False
+    
+    @_serialized
+    def get_findings_scalars(self) -> Dict[str, Any]:
+        """
+        Best/worst rated and most/least variable categories, the count of significant
+        categories and category size stats, in one aggregate over the category stats
+        Results are cached until the dataset is reloaded
+        """
+        cached = self._get_cached('findings_scalars')
+        if cached is not None:
+            return dict(cached)
+        
+        conn = self.connect()
+        
+        try:
+            self._refresh_category_stats(conn)
+            cursor = conn.execute("""
+                SELECT 
+                    COUNT(*) as category_count,
+                    ARG_MAX(category, avg_rating) as best_category,
+                    MAX(avg_rating) as best_avg_rating,
+                    ARG_MAX(product_count, avg_rating) as best_product_count,
+                    ARG_MIN(category, avg_rating) as worst_category,
+                    MIN(avg_rating) as worst_avg_rating,
+                    ARG_MAX(category, rating_variance) as highest_variance_category,
+                    MAX(rating_variance) as highest_variance,
+                    ARG_MIN(category, rating_variance) as lowest_variance_category,
+                    MIN(rating_variance) as lowest_variance,
+                    COUNT(*) FILTER (WHERE significance_level = 'Significant') as significant_count,
+                    ROUND(AVG(product_count), 1) as average_products_per_category,
+                    MAX(product_count) as largest_category_size,
+                    MIN(product_count) as smallest_category_size
+                FROM category_stats_cache
+            """)
+            
+            columns = [column[0] for column in cursor.description]
+            row = cursor.fetchone()
+            if not row:
+                return {}
+            stats = dict(zip(columns, row))
+            self._set_cached('findings_scalars', stats)
+            return dict(stats)
+            
+        except Exception as e:
+            logger.error(f"Error in key findings query: {e}")
+            return {}
+    
+    @_serialized
+    def get_category_extremes(self, k: int = 3) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        First and last k categories of the category stats order (category, avg_rating,
+        product_count), each list in that order, from one ranked query
+        
+        Args:
+            k: Number of categories at each end
+        """
+        conn = self.connect()
+        
+        try:
+            self._refresh_category_stats(conn)
+            rows = conn.execute(CATEGORY_EXTREMES_QUERY, [k]).fetchall()
+            
+            top, bottom = [], []
+            for kind, category, avg_rating, product_count in rows:
+                bucket = top if kind == 'top' else bottom
+                bucket.append({"category": category, "avg_rating": avg_rating, "product_count": product_count})
+            # Bottom ranks count from the end; restore the stats order
+            bottom.reverse()
+            return top, bottom
+            
+        except Exception as e:
+            logger.error(f"Error in category extremes query: {e}")
+            return [], []
+    
+    def _refresh_category_stats(self, conn):
+        """
+        Materialize per-category statistics for the current dataset into a temp table
+        The aggregate is persisted as Parquet so later runs only scan that small file
+        Both are keyed by the table contents, so a reload through any handler or
+        process is picked up
+        """
+        key = self._content_key(conn)
+        if self._category_stats_key == key:
+            return
+        
+        if not conn.execute("SELECT EXISTS (SELECT 1 FROM amazon_products)").fetchone()[0]:
+            # Nothing to persist or remember for an empty table; check again next call
+            conn.execute(f"CREATE OR REPLACE TEMP TABLE category_stats_cache AS {CATEGORY_ANALYSIS_QUERY}")
+            return
+        
+        path = os.path.join(self.results_cache_dir, f"{CATEGORY_STATS_NAME}-{key}.parquet")
+        if not os.path.exists(path):
+            partial = path + ".part"
+            try:
+                os.makedirs(self.results_cache_dir, exist_ok=True)
+                conn.execute(f"COPY ({CATEGORY_ANALYSIS_QUERY}) TO {_sql_literal(partial)} (FORMAT PARQUET)")
+                os.replace(partial, path)
+            except Exception as e:
+                logger.warning(f"Could not persist category stats to {path}: {e}")
+                conn.execute(f"CREATE OR REPLACE TEMP TABLE category_stats_cache AS {CATEGORY_ANALYSIS_QUERY}")
+                self._category_stats_key = key
+                return
+            
+            for stale in glob.glob(os.path.join(self.results_cache_dir, f"{CATEGORY_STATS_NAME}-*")):
+                if stale != path:
+                    os.remove(stale)
+        
+        conn.execute(f"CREATE OR REPLACE TEMP TABLE category_stats_cache AS SELECT * FROM read_parquet({_sql_literal(path)})")
+        self._category_stats_key = key
+    
+    def _invalidate_persisted_results(self):
+        """Remove the persisted category stats and results after the dataset source changes"""
+        for path in glob.glob(os.path.join(self.results_cache_dir, "*")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def _content_key(self, conn) -> str:
+        """Short hash of the amazon_products row count, max rowid and recorded source file"""
+        row = conn.execute("""
+            SELECT 
+                COUNT(*), 
+                MAX(rowid),
+                (SELECT value FROM dataset_metadata WHERE key = 'amazon_source')
+            FROM amazon_products
+        """).fetchone()
+        return hashlib.sha1(repr(row).encode()).hexdigest()[:16]
+    
+    def _persisted_path(self, conn, name: str, ext: str) -> str:
+        """Cache file for a named result of the current table contents"""
+        return os.path.join(self.results_cache_dir, f"{name}-{self._content_key(conn)}.{ext}")
+    
+    def _load_persisted(self, path: str, conn) -> Any:
+        """Read a persisted DataFrame (.parquet) or dict (.json), or None if absent"""
+        if not os.path.exists(path):
+            return None
+        
+        try:
+            if path.endswith('.parquet'):
+                return conn.execute(f"SELECT * FROM read_parquet({_sql_literal(path)})").df()
+            with open(path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable result cache {path}: {e}")
+            return None
+    
+    def _persist(self, path: str, result: Any, conn):
+        """Write a DataFrame (.parquet) or dict (.json) result and drop older versions of it"""
+        os.makedirs(self.results_cache_dir, exist_ok=True)
+        partial = path + ".part"
+        
+        try:
+            if path.endswith('.parquet'):
+                conn.register('persist_result', result)
+                try:
+                    conn.execute(f"COPY persist_result TO {_sql_literal(partial)} (FORMAT PARQUET)")
+                finally:
+                    conn.unregister('persist_result')
+            else:
+                with open(partial, 'w') as f:
+                    f.write(json.dumps(result, default=json_default))
+            os.replace(partial, path)
+        except Exception as e:
+            logger.warning(f"Could not persist result cache {path}: {e}")
+            return
+        
+        name = os.path.basename(path).rsplit('-', 1)[0]
+        for stale in glob.glob(os.path.join(self.results_cache_dir, f"{name}-*")):
+            if stale != path:
+                os.remove(stale)
+    
+    def _get_cached(self, key: str) -> Any:
+        """Return a cached result if it was computed for the current dataset"""
+        cached = self._result_cache.get(key)
+        if cached is not None and cached[0] == self.dataset_version:
+            return cached[1]
+        return None
+    
+    def _set_cached(self, key: str, result: Any, version: Optional[int] = None):
+        """
+        Cache a result for the dataset version it was computed from (default: current)
+        Unserialized readers pass the version seen before querying, so a result read
+        during a reload is never stored under the new version
+        """
+        self._result_cache[key] = (self.dataset_version if version is None else version, result)
+    
     def get_statistical_insights(self) -> Dict[str, Any]:
         """
         Generate comprehensive statistical insights optimized for large datasets
         Includes advanced analytics suitable for dashboard integration
+        Results are cached until the dataset is reloaded
         """
-        conn = self.connect()
+        cached = self._get_cached('statistical_insights')
+        if cached is not None:
+            return dict(cached)
+        
+        version = self.dataset_version
+        # Own cursor so this can run on a worker thread next to other queries
+        conn = self.cursor()
         
         try:
+            # Reuse insights persisted by an earlier process for the same table contents
+            persisted_path = self._persisted_path(conn, 'statistical_insights', 'json')
+            persisted = self._load_persisted(persisted_path, conn)
+            if persisted is not None:
+                self._set_cached('statistical_insights', persisted, version)
+                return dict(persisted)
+            
             # Overall dataset statistics with performance optimizations
             overall_query = """
             SELECT 
@@ -514,17 +1195,34 @@ class DuckDBHandler:
             }
             
             logger.info("Statistical insights analysis completed successfully")
-            return insights
+            self._set_cached('statistical_insights', insights, version)
+            self._persist(persisted_path, insights, conn)
+            return dict(insights)
             
         except Exception as e:
             logger.error(f"Error generating statistical insights: {e}")
             return {"error": str(e), "generated_at": datetime.now().isoformat()}
+        
+        finally:
+            conn.close()
     
     def get_rating_distribution(self) -> pd.DataFrame:
-        """Get rating distribution analysis"""
-        conn = self.connect()
+        """Get rating distribution analysis (cached until the dataset is reloaded)"""
+        cached = self._get_cached('rating_distribution')
+        if cached is not None:
+            return cached.copy()
+        
+        version = self.dataset_version
+        # Own cursor so this can run on a worker thread next to other queries
+        conn = self.cursor()
         
         try:
+            persisted_path = self._persisted_path(conn, 'rating_distribution', 'parquet')
+            persisted = self._load_persisted(persisted_path, conn)
+            if persisted is not None:
+                self._set_cached('rating_distribution', persisted, version)
+                return persisted.copy()
+            
             query = """
             SELECT 
                 category,
@@ -538,12 +1236,18 @@ class DuckDBHandler:
             """
             
             df = conn.execute(query).df()
-            return df
+            self._set_cached('rating_distribution', df, version)
+            self._persist(persisted_path, df, conn)
+            return df.copy()
             
         except Exception as e:
             logger.error(f"Error in rating distribution analysis: {e}")
             return pd.DataFrame()
+        
+        finally:
+            conn.close()
     
+    @_serialized
     def execute_custom_query(self, query: str) -> pd.DataFrame:
         """Execute custom SQL query and return DataFrame"""
         conn = self.connect()
@@ -555,6 +1259,7 @@ class DuckDBHandler:
             logger.error(f"Error executing custom query: {e}")
             return pd.DataFrame()
     
+    @_serialized
     def get_table_info(self, table_name: str) -> pd.DataFrame:
         """Get information about a table"""
         conn = self.connect()
@@ -566,83 +1271,124 @@ class DuckDBHandler:
             logger.error(f"Error getting table info for {table_name}: {e}")
             return pd.DataFrame()
     
-    def export_analysis_results(self, output_dir: str = "data/analysis_results/"):
-        """Export analysis results to CSV files"""
+    def export_analysis_results(self, output_dir: str = "data/analysis_results/",
+                                category_stats: Optional[List[Dict[str, Any]]] = None,
+                                rating_distribution: Optional[List[Dict[str, Any]]] = None,
+                                insights: Optional[Dict[str, Any]] = None):
+        """
+        Export analysis results to CSV files
+        Results already computed by the caller (as row dicts) are written as-is
+        instead of being queried again
+        """
         os.makedirs(output_dir, exist_ok=True)
         
         try:
             # Category analysis
-            category_analysis = self.get_category_analysis()
-            if not category_analysis.empty:
-                category_analysis.to_csv(f"{output_dir}/category_analysis.csv", index=False)
+            if category_stats is not None:
+                _write_records_csv(f"{output_dir}/category_analysis.csv", category_stats)
+                logger.info(f"Exported category analysis to {output_dir}/category_analysis.csv")
+            elif self.export_category_stats(f"{output_dir}/category_analysis.csv"):
+                # Written by DuckDB COPY from the materialized stats, no DataFrame round-trip
                 logger.info(f"Exported category analysis to {output_dir}/category_analysis.csv")
             
             # Rating distribution
-            rating_dist = self.get_rating_distribution()
-            if not rating_dist.empty:
-                rating_dist.to_csv(f"{output_dir}/rating_distribution.csv", index=False)
+            if rating_distribution is not None:
+                _write_records_csv(f"{output_dir}/rating_distribution.csv", rating_distribution)
                 logger.info(f"Exported rating distribution to {output_dir}/rating_distribution.csv")
+            else:
+                rating_dist = self.get_rating_distribution()
+                if not rating_dist.empty:
+                    rating_dist.to_csv(f"{output_dir}/rating_distribution.csv", index=False)
+                    logger.info(f"Exported rating distribution to {output_dir}/rating_distribution.csv")
             
             # Statistical insights
-            insights = self.get_statistical_insights()
+            if insights is None:
+                insights = self.get_statistical_insights()
             if insights:
-                import json
                 with open(f"{output_dir}/statistical_insights.json", 'w') as f:
-                    json.dump(insights, f, indent=2)
+                    # DuckDB returns DECIMAL columns as Decimal, which json can't encode
+                    f.write(json.dumps(insights, indent=2, default=json_default))
                 logger.info(f"Exported statistical insights to {output_dir}/statistical_insights.json")
             
         except Exception as e:
             logger.error(f"Error exporting analysis results: {e}")
     
+    @_serialized
     def close(self):
         """Close database connection"""
         if self.conn:
+            with self._cursor_factory_lock:
+                self._cursor_factory.close()
+                self._cursor_factory = None
             self.conn.close()
             self.conn = None
+            # Temp tables are dropped with the connection
+            self._category_stats_key = None
+    
+    def _ensure_analytics_table(self, conn):
+        """Create the scraping analytics table if it doesn't exist"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scraping_analytics (
+                id INTEGER,
+                product_id INTEGER,
+                total_reviews INTEGER,
+                scraping_method VARCHAR,
+                scraping_time DECIMAL(10,3),
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
     
     def insert_analytics_data(self, data: Dict[str, Any]) -> bool:
         """Insert analytics data for tracking scraping performance"""
+        return self.insert_analytics_batch([data]) == 1
+    
+    @_serialized
+    def insert_analytics_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Bulk insert analytics rows in a single statement
+        Registers the batch as an Arrow (or DataFrame) view instead of issuing one INSERT per row
+        """
+        if not rows:
+            return 0
+        
         conn = self.connect()
         
         try:
-            # Create analytics table if it doesn't exist
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS scraping_analytics (
-                    id INTEGER,
-                    product_id INTEGER,
-                    total_reviews INTEGER,
-                    scraping_method VARCHAR,
-                    scraping_time DECIMAL(10,3),
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            self._ensure_analytics_table(conn)
             
-            # Get next ID
-            next_id_result = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM scraping_analytics").fetchone()
-            next_id = next_id_result[0] if next_id_result else 1
+            now = datetime.now()
+            columns = {
+                'product_id': [row.get('product_id') for row in rows],
+                'total_reviews': [row.get('total_reviews', 0) for row in rows],
+                'scraping_method': [row.get('scraping_method', 'unknown') for row in rows],
+                'scraping_time': [row.get('scraping_time', 0.0) for row in rows],
+                'timestamp': [row.get('timestamp', now) for row in rows]
+            }
+            # Arrow tables are scanned by DuckDB without conversion; pandas is the fallback
+            batch = pa.Table.from_pydict(columns) if pa is not None else pd.DataFrame(columns)
             
-            # Insert data
-            conn.execute("""
-                INSERT INTO scraping_analytics 
-                (id, product_id, total_reviews, scraping_method, scraping_time, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                next_id,
-                data.get('product_id'),
-                data.get('total_reviews', 0),
-                data.get('scraping_method', 'unknown'),
-                data.get('scraping_time', 0.0),
-                data.get('timestamp', pd.Timestamp.now())
-            ))
+            conn.register('analytics_batch', batch)
+            try:
+                conn.execute("""
+                    INSERT INTO scraping_analytics 
+                    (id, product_id, total_reviews, scraping_method, scraping_time, timestamp)
+                    SELECT 
+                        (SELECT COALESCE(MAX(id), 0) FROM scraping_analytics) + ROW_NUMBER() OVER (),
+                        product_id, total_reviews, scraping_method, scraping_time, timestamp
+                    FROM analytics_batch
+                """)
+            finally:
+                conn.unregister('analytics_batch')
             
             conn.commit()
-            logger.info("Analytics data inserted successfully")
-            return True
+            logger.info(f"Inserted {len(rows)} analytics rows")
+            return len(rows)
             
         except Exception as e:
             logger.error(f"Error inserting analytics data: {e}")
-            return False
+            return 0
     
+    @_serialized
     def get_analytics_summary(self) -> Dict[str, Any]:
         """Get analytics summary for FastAPI"""
         conn = self.connect()
@@ -0,0 +1,33 @@
+"""
+JSON encoding helpers shared by the storage handlers, the analyzers and the API
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+def json_default(value: Any) -> Any:
+    """
+    default= hook for json.dumps and orjson.dumps: DuckDB DECIMALs become floats,
+    dates and times ISO strings, numpy scalars plain Python numbers
+    Anything else raises TypeError instead of being silently stringified
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if hasattr(value, 'item') and getattr(value, 'ndim', 0) == 0:  # numpy scalar
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def to_json_types(value: Any) -> Any:
+    """
+    Convert a result to plain JSON types in one walk, using json_default for the leaves
+    and stringifying non-str dict keys, so the stdlib encoder never calls back into Python
+    """
+    if isinstance(value, dict):
+        return {key if isinstance(key, str) else str(key): to_json_types(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_types(item) for item in value]
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return json_default(value)
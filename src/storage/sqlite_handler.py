@@ -7,15 +7,37 @@ from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import json
 import os
+import threading
 from contextlib import contextmanager
 
+from .serialization import json_default
+
+# orjson parses and serializes the export in C; fall back to json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 class SQLiteHandler:
     """SQLite database handler for scraping data"""
     
+    # Connection-level settings applied once when the connection is opened
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+    )
+    
     def __init__(self, db_path: str = "data/newegg_scraper.db"):
         self.db_path = db_path
+        self.conn = None
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
         self.ensure_directory()
         self.init_database()
     
@@ -23,22 +45,57 @@ class SQLiteHandler:
         """Ensure the data directory exists"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
+    def connect(self) -> sqlite3.Connection:
+        """Open the shared SQLite connection (once) and apply PRAGMAs"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row  # Enable dict-like access
+            for pragma in self.PRAGMAS:
+                self.conn.execute(pragma)
+        return self.conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
-            yield conn
-        except Exception as e:
-            if conn:
+        """Context manager for the shared database connection"""
+        with self._lock:
+            conn = self.connect()
+            try:
+                yield conn
+            except Exception as e:
+                if not self._transaction_depth:
+                    conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise
+    
+    @contextmanager
+    def transaction(self):
+        """Run several writes as one BEGIN IMMEDIATE ... COMMIT transaction"""
+        with self._lock:
+            conn = self.connect()
+            if self._transaction_depth:
+                # Nested call joins the outer transaction
+                self._transaction_depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._transaction_depth -= 1
+                return
+            
+            conn.execute("BEGIN IMMEDIATE")
+            self._transaction_depth = 1
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
                 conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            if conn:
-                conn.close()
+                raise
+            finally:
+                self._transaction_depth = 0
+    
+    def _commit(self, conn: sqlite3.Connection):
+        """Commit unless the write is part of an explicit transaction"""
+        if not self._transaction_depth:
+            conn.commit()
     
     def init_database(self):
         """Initialize database with required tables"""
@@ -134,7 +191,7 @@ class SQLiteHandler:
                         product_data.get("description"),
                         product_id
                     ))
-                    logger.info(f"Updated existing product {product_id}")
+                    logger.info("Updated existing product %s", product_id)
                 else:
                     # Insert new product
                     cursor.execute("""
@@ -150,9 +207,9 @@ class SQLiteHandler:
                         product_data.get("url")
                     ))
                     product_id = cursor.lastrowid
-                    logger.info(f"Inserted new product {product_id}")
+                    logger.info("Inserted new product %s", product_id)
                 
-                conn.commit()
+                self._commit(conn)
                 return product_id
                 
             except Exception as e:
@@ -168,15 +225,25 @@ class SQLiteHandler:
             cursor = conn.cursor()
             
             try:
-                new_reviews_count = 0
+                # Look up already-stored review IDs in a single query
+                incoming_ids = [review.get("review_id") for review in reviews if review.get("review_id")]
+                existing_ids = set()
+                if incoming_ids:
+                    placeholders = ",".join("?" * len(incoming_ids))
+                    cursor.execute(
+                        f"SELECT review_id FROM reviews WHERE review_id IN ({placeholders})",
+                        incoming_ids
+                    )
+                    existing_ids = {row[0] for row in cursor.fetchall()}
                 
+                rows = []
                 for review in reviews:
-                    # Check if review already exists
+                    # Skip existing reviews (and duplicates within this batch)
                     review_id = review.get("review_id")
                     if review_id:
-                        cursor.execute("SELECT id FROM reviews WHERE review_id = ?", (review_id,))
-                        if cursor.fetchone():
-                            continue  # Skip existing review
+                        if review_id in existing_ids:
+                            continue
+                        existing_ids.add(review_id)
                     
                     # Parse date
                     review_date = None
@@ -189,13 +256,7 @@ class SQLiteHandler:
                         except (ValueError, TypeError):
                             pass
                     
-                    # Insert new review
-                    cursor.execute("""
-                        INSERT INTO reviews (
-                            product_id, reviewer_name, rating, title, body, 
-                            review_date, verified_purchase, review_id, product_url
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                    rows.append((
                         product_id,
                         review.get("reviewer_name"),
                         review.get("rating"),
@@ -206,16 +267,32 @@ class SQLiteHandler:
                         review_id,
                         review.get("product_url")
                     ))
-                    new_reviews_count += 1
                 
-                conn.commit()
-                logger.info(f"Saved {new_reviews_count} new reviews")
+                # Insert all new reviews in one batch
+                cursor.executemany("""
+                    INSERT INTO reviews (
+                        product_id, reviewer_name, rating, title, body, 
+                        review_date, verified_purchase, review_id, product_url
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                new_reviews_count = len(rows)
+                
+                self._commit(conn)
+                logger.info("Saved %d new reviews", new_reviews_count)
                 return new_reviews_count
                 
             except Exception as e:
                 logger.error(f"Error saving reviews: {e}")
                 raise
     
+    def save_product_with_reviews(self, product_data: Dict[str, Any], 
+                                  reviews: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Save a product and its reviews in a single transaction"""
+        with self.transaction():
+            product_id = self.save_product(product_data)
+            new_reviews_count = self.save_reviews(reviews, product_id) if reviews else 0
+        return product_id, new_reviews_count
+    
     def save_scraping_session(self, session_data: Dict[str, Any]) -> int:
         """Save scraping session information"""
         with self.get_connection() as conn:
@@ -237,8 +314,8 @@ class SQLiteHandler:
                 ))
                 
                 session_id = cursor.lastrowid
-                conn.commit()
-                logger.info(f"Saved scraping session {session_id}")
+                self._commit(conn)
+                logger.info("Saved scraping session %s", session_id)
                 return session_id
                 
             except Exception as e:
@@ -334,14 +411,14 @@ class SQLiteHandler:
                     SELECT 
                         p.*,
                         GROUP_CONCAT(
-                            json_object(
+                            CASE WHEN r.id IS NOT NULL THEN json_object(
                                 'reviewer_name', r.reviewer_name,
                                 'rating', r.rating,
                                 'title', r.title,
                                 'body', r.body,
                                 'review_date', r.review_date,
                                 'verified_purchase', r.verified_purchase
-                            )
+                            ) END
                         ) as reviews_json
                     FROM products p
                     LEFT JOIN reviews r ON p.id = r.product_id
@@ -352,12 +429,12 @@ class SQLiteHandler:
                 for row in cursor.fetchall():
                     product = dict(row)
                     
-                    # Parse reviews JSON
+                    # GROUP_CONCAT joins the review objects with commas, so the
+                    # bracketed string is one JSON array parsed in a single call
                     if product['reviews_json']:
                         try:
-                            reviews_data = product['reviews_json'].split(',')
-                            product['reviews'] = [json.loads(r) for r in reviews_data if r.strip()]
-                        except json.JSONDecodeError:
+                            product['reviews'] = _json_loads(f"[{product['reviews_json']}]")
+                        except ValueError:
                             product['reviews'] = []
                     else:
                         product['reviews'] = []
@@ -365,9 +442,13 @@ class SQLiteHandler:
                     del product['reviews_json']
                     products.append(product)
                 
-                # Write to file
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(products, f, indent=2, default=str)
+                # Serialize in memory and write once (json.dump writes per token)
+                if orjson is not None:
+                    with open(output_file, 'wb') as f:
+                        f.write(orjson.dumps(products, default=json_default, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(output_file, 'w', encoding='utf-8') as f:
+                        f.write(json.dumps(products, indent=2, default=json_default))
                 
                 logger.info(f"Exported data to {output_file}")
                 return True
@@ -392,6 +473,12 @@ class SQLiteHandler:
             logger.info(f"Cleaned up {deleted_count} old sessions")
             return deleted_count
 
+    @staticmethod
+    def _rows_to_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+        """Build row dicts in one pass using the cursor's column names"""
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
     def get_products(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """Get list of products with pagination"""
         with self.get_connection() as conn:
@@ -403,15 +490,7 @@ class SQLiteHandler:
                 LIMIT ? OFFSET ?
             """, (limit, offset))
             
-            products = []
-            for row in cursor.fetchall():
-                product = dict(row)
-                # Convert datetime strings to proper format
-                if product.get('scraped_at'):
-                    product['scraped_at'] = product['scraped_at']
-                products.append(product)
-            
-            return products
+            return self._rows_to_dicts(cursor)
     
     def get_products_count(self) -> int:
         """Get total count of products"""
@@ -445,15 +524,10 @@ class SQLiteHandler:
                 LIMIT ? OFFSET ?
             """, (product_id, limit, offset))
             
-            reviews = []
-            for row in cursor.fetchall():
-                review = dict(row)
-                # Convert datetime fields
+            reviews = self._rows_to_dicts(cursor)
+            for review in reviews:
                 if review.get('review_date'):
                     review['date'] = review['review_date']
-                if review.get('scraped_at'):
-                    review['scraped_at'] = review['scraped_at']
-                reviews.append(review)
             
             return reviews
     
@@ -465,6 +539,9 @@ class SQLiteHandler:
             return cursor.fetchone()[0]
     
     def close(self):
-        """Close database connections (for FastAPI lifespan)"""
-        # SQLite connections are managed per request, so nothing to close
+        """Close database connection (for FastAPI lifespan)"""
+        with self._lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
         logger.info("SQLite handler closed")